@@ -0,0 +1,253 @@
+"""
+Benchmarks for parsing, instantiating, formatting and sub-type checking contracts.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--setup MODULE:FUNCTION]
+                                        [--save-baseline FILE] [--compare FILE]
+
+The standard contracts (Train, Predict, Export) are benchmarked along with
+synthetic contracts with many parameters ('wide') and long chains of dependent
+parameters ('deep'). Type-arguments are the base types of each parameter's
+bound, so no server-specific types are required. Parsing benchmarks additionally
+require the ufdl.jobtypes type-system to be initialised, which can be done by
+naming an initialisation function with --setup; they are skipped otherwise.
+
+Each benchmark reports its throughput, and the number of memory blocks and bytes
+allocated per operation. Results can be saved as a baseline and later compared
+against, in which case the exit status is non-zero if any benchmark is slower
+than the baseline by more than the given threshold.
+"""
+import argparse
+import gc
+import importlib
+import json
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from ufdl.jobtypes.standard import JobOutput, Model, PK
+from ufdl.jobtypes.standard.server import Dataset, Domain, Framework
+
+from ufdl.jobcontracts.base import InputConstructor, OutputConstructor, UFDLJobContract
+from ufdl.jobcontracts.cache import set_contract_cache_size
+from ufdl.jobcontracts.initialise import initialise_server
+from ufdl.jobcontracts.params import JobContractParams, TypeConstructor
+from ufdl.jobcontracts.standard import Export, Predict, Train
+from ufdl.jobcontracts.util import format_contract, parse_contract
+
+# Benchmark name -> (operations per second, allocated blocks per op, allocated bytes per op)
+Results = Dict[str, Tuple[float, float, float]]
+
+
+def make_wide_contract(width: int) -> Type[UFDLJobContract]:
+    """
+    Creates a contract class with a domain and framework parameter, an input
+    and an output for each of width models.
+    """
+    params = JobContractParams()
+    inputs = {}
+    outputs = {}
+    for index in range(width):
+        domain = params.add_simple_param(f"Domain{index}", Domain())
+        framework = params.add_simple_param(f"Framework{index}", Framework())
+        inputs[f"dataset{index}"] = InputConstructor(
+            TypeConstructor.indirect_dependency(PK, TypeConstructor.indirect_dependency(Dataset, domain)),
+            help=f"Dataset {index}"
+        )
+        outputs[f"model{index}"] = OutputConstructor(
+            TypeConstructor.indirect_dependency(Model, domain, framework),
+            help=f"Model {index}"
+        )
+
+    class Wide(UFDLJobContract, params=params, inputs=inputs, outputs=outputs):
+        __slots__ = tuple()
+
+    Wide.__name__ = Wide.__qualname__ = f"Wide{width}"
+
+    return Wide
+
+
+def make_deep_contract(depth: int) -> Type[UFDLJobContract]:
+    """
+    Creates a contract class with a chain of depth parameters, each depending on
+    the one before it, and an input depending on the last.
+    """
+    params = JobContractParams()
+    domain = params.add_simple_param("DomainType", Domain())
+    framework = params.add_simple_param("FrameworkType", Framework())
+    previous = params.add_dependent_param("Param0", Model, domain, framework)
+    for index in range(1, depth):
+        previous = params.add_dependent_param(f"Param{index}", JobOutput, previous)
+
+    class Deep(
+        UFDLJobContract,
+        params=params,
+        inputs={
+            "previous": InputConstructor(
+                TypeConstructor.indirect_dependency(JobOutput, previous),
+                help="The last parameter in the chain"
+            )
+        },
+        outputs={}
+    ):
+        __slots__ = tuple()
+
+    Deep.__name__ = Deep.__qualname__ = f"Deep{depth}"
+
+    return Deep
+
+
+def base_types(contract_cls: Type[UFDLJobContract]) -> Dict[str, object]:
+    """
+    Gets the base type of the bound of each parameter of a contract class.
+    """
+    return {
+        param.name: param.bound_base
+        for param in contract_cls.params()
+    }
+
+
+def measure(operation: Callable[[], object], min_time: float) -> Tuple[float, float, float]:
+    """
+    Measures the throughput and allocations of an operation.
+    """
+    # Determine how many iterations fill the minimum time
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        iterations *= 2
+
+    # Best of several repeats
+    best = elapsed
+    for _ in range(2):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            operation()
+        best = min(best, time.perf_counter() - start)
+
+    # Count allocations for a single operation
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    operation()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = [
+        stat
+        for stat in after.compare_to(before, "filename")
+        if stat.traceback[0].filename != tracemalloc.__file__
+    ]
+    blocks = sum(max(stat.count_diff, 0) for stat in stats)
+    size = sum(max(stat.size_diff, 0) for stat in stats)
+
+    return iterations / best, blocks, size
+
+
+def run(min_time: float, parsing: bool) -> Results:
+    contract_classes: List[Type[UFDLJobContract]] = [Train, Predict, Export]
+    for width in (4, 16):
+        contract_classes.append(make_wide_contract(width))
+    for depth in (4, 16):
+        try:
+            contract_classes.append(make_deep_contract(depth))
+        except Exception as e:
+            print(f"Skipping deep contract of depth {depth}: {e}", file=sys.stderr)
+
+    names = {
+        contract_cls.__name__: contract_cls
+        for contract_cls in contract_classes
+    }
+    initialise_server(names)
+
+    results: Results = {}
+
+    def bench(name: str, operation: Callable[[], object]):
+        results[name] = measure(operation, min_time)
+        ops, blocks, size = results[name]
+        print(f"{name:<50} {ops:>12.1f} ops/s {blocks:>8.1f} blocks/op {size:>10.1f} B/op")
+
+    for name, contract_cls in names.items():
+        types = base_types(contract_cls)
+        params = contract_cls.params()
+
+        # Uncached instantiation and bound propagation
+        set_contract_cache_size(0)
+        params.set_bounds_cache_size(0)
+        bench(f"{name}.__init__", lambda: contract_cls(types))
+        if parsing:
+            contract_string = str(contract_cls(types))
+            bench(f"parse_contract({name})", lambda: parse_contract(contract_string))
+        bench(f"{name}.get_new_bounds_for_fixed", lambda: params.get_new_bounds_for_fixed(**types))
+
+        # Cached instantiation and bound propagation
+        set_contract_cache_size(256)
+        params.set_bounds_cache_size(JobContractParams.BOUNDS_CACHE_SIZE)
+        contract = contract_cls(types)
+        bench(f"{name}.__init__ [cached]", lambda: contract_cls(types))
+        if parsing:
+            bench(f"parse_contract({name}) [cached]", lambda: parse_contract(contract_string))
+        bench(f"{name}.get_new_bounds_for_fixed [cached]", lambda: params.get_new_bounds_for_fixed(**types))
+
+        bench(f"format_contract({name}, include_io=True)", lambda: format_contract(contract, include_io=True))
+        bench(f"{name}.is_subtype_of", lambda: contract.is_subtype_of(contract))
+
+    return results
+
+
+def compare(results: Results, baseline: Results, threshold: float) -> bool:
+    """
+    Prints the change in throughput of each benchmark relative to the baseline.
+
+    :return:
+                Whether any benchmark regressed by more than the threshold.
+    """
+    regressed = False
+    for name, (ops, _, _) in results.items():
+        if name not in baseline:
+            continue
+        change = (ops - baseline[name][0]) / baseline[name][0]
+        flag = ""
+        if change < -threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(f"{name:<50} {change:>+8.1%}{flag}")
+    return regressed
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--setup", help="MODULE:FUNCTION to call to initialise the ufdl.jobtypes type-system")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds to run each benchmark for")
+    parser.add_argument("--save-baseline", metavar="FILE", help="Save the results to FILE")
+    parser.add_argument("--compare", metavar="FILE", help="Compare the results to the baseline in FILE")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Slow-down which counts as a regression")
+    parsed = parser.parse_args(args)
+
+    parsing = parsed.setup is not None
+    if parsing:
+        module_name, function_name = parsed.setup.split(":")
+        getattr(importlib.import_module(module_name), function_name)()
+
+    results = run(parsed.min_time, parsing)
+
+    if parsed.save_baseline is not None:
+        with open(parsed.save_baseline, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if parsed.compare is not None:
+        with open(parsed.compare) as file:
+            baseline = {name: tuple(result) for name, result in json.load(file).items()}
+        if compare(results, baseline, parsed.threshold):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -39,5 +39,10 @@ setup(
         "ufdl.jobtypes"
     ],
     entry_points={
+        "ufdl.jobcontracts": [
+            "Export = ufdl.jobcontracts.standard._Export:Export",
+            "Predict = ufdl.jobcontracts.standard._Predict:Predict",
+            "Train = ufdl.jobcontracts.standard._Train:Train",
+        ]
     }
 )
@@ -0,0 +1,50 @@
+import threading
+from typing import Callable, TypeVar
+
+ValueType = TypeVar('ValueType')
+
+# Serialises the first assignment of lazily-initialised attributes
+LAZY_INITIALISATION_LOCK = threading.Lock()
+
+
+class Immutable:
+    """
+    Mix-in which only allows each attribute of an object to be assigned once,
+    so that the object cannot be modified after it has been initialised.
+    """
+    __slots__ = tuple()
+
+    def __setattr__(self, name: str, value):
+        if hasattr(self, name):
+            raise AttributeError(f"Can't reassign attribute '{name}' of immutable {type(self).__name__}")
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"Can't delete attribute '{name}' of immutable {type(self).__name__}")
+
+    def _get_lazily(self, name: str, create: Callable[[], ValueType]) -> ValueType:
+        """
+        Gets the value of an attribute which is only assigned on first access.
+        If several threads access it first at once, they all get the value
+        assigned by whichever finishes creating it first.
+
+        :param name:
+                    The name of the attribute.
+        :param create:
+                    Function which creates the value of the attribute.
+        :return:
+                    The value of the attribute.
+        """
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            pass
+
+        value = create()
+
+        with LAZY_INITIALISATION_LOCK:
+            try:
+                return getattr(self, name)
+            except AttributeError:
+                object.__setattr__(self, name, value)
+                return value
@@ -1,12 +1,19 @@
-from typing import Any, Generic
+import os
+from typing import Any, ContextManager, Generic, Tuple, Union
 
 from ufdl.jobtypes.base import UFDLJSONType, UFDLType, InputType
 
+from .._immutable import Immutable
+from ..cache import MAPPED_FILE_CACHE, is_subtype, type_key
+from ._InputValidator import InputValidator
+
+
+class Input(Immutable, Generic[InputType]):
+    __slots__ = ("_name", "_types", "_help", "_hash", "_validator")
 
-class Input(Generic[InputType]):
     def __init__(self, name: str, *types: UFDLJSONType[tuple, InputType, Any], help: str):
         for input_type in types:
-            if not isinstance(input_type, UFDLType) or not input_type.is_subtype_of(UFDLJSONType()):
+            if not isinstance(input_type, UFDLType) or not is_subtype(input_type, UFDLJSONType()):
                 raise ValueError(
                     f"All input types must be JSON-compatible UFDL types, received: "
                     f"({type(input_type)}) {input_type}"
@@ -27,3 +34,41 @@ class Input(Generic[InputType]):
     @property
     def help(self):
         return self._help
+
+    @property
+    def validator(self) -> InputValidator:
+        return self._get_lazily("_validator", lambda: InputValidator(*self._types))
+
+    def parse_value(self, value: Any) -> Tuple[UFDLJSONType, InputType]:
+        """
+        Validates and decodes a JSON value for this input.
+
+        :param value:
+                    The JSON value.
+        :return:
+                    The type of this input which accepted the value, and the decoded value.
+        """
+        return self.validator(value)
+
+    def map_file(self, path: Union[str, os.PathLike]) -> ContextManager[memoryview]:
+        """
+        Resolves a binary value for this input which is held in a local file
+        (e.g. a cached model) to a read-only, memory-mapped view of the file,
+        without reading it into memory. The map is shared with all other
+        current users of the same file.
+
+        :param path:
+                    The path to the local file.
+        :return:
+                    A context manager giving the view of the file's contents.
+        """
+        return MAPPED_FILE_CACHE.mapped(path)
+
+    def _key(self):
+        return self._name, tuple(type_key(input_type) for input_type in self._types), self._help
+
+    def __eq__(self, other):
+        return self is other or (isinstance(other, Input) and self._key() == other._key())
+
+    def __hash__(self):
+        return self._get_lazily("_hash", lambda: hash(self._key()))
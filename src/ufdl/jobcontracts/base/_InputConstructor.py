@@ -1,31 +1,46 @@
-from typing import Dict, Union
+from typing import Dict, FrozenSet, Hashable, Optional, Union
 
 from ufdl.jobtypes.base import UFDLJSONType, UFDLType
 
+from .._immutable import Immutable
+from ..cache import LRUCache, is_subtype, types_key
 from ..params import TypeConstructor
 from ._Input import Input
 
 
-class InputConstructor:
+class InputConstructor(Immutable):
+    __slots__ = ("_name", "_type_constructors", "_help", "_dependencies", "_construction_cache")
+
+    # The maximum number of constructed inputs cached by each constructor
+    CONSTRUCTION_CACHE_SIZE: Optional[int] = 128
+
     def __init__(self, *type_constructors: Union[UFDLType, TypeConstructor], help: str):
         for type_constructor in type_constructors:
             if isinstance(type_constructor, TypeConstructor):
                 bound_base = type_constructor.bound_base
-                if bound_base is not None and not bound_base.is_subtype_of(UFDLJSONType()):
+                if bound_base is not None and not is_subtype(bound_base, UFDLJSONType()):
                     raise ValueError(f"Input constructor is not guaranteed to construct a JSON-compatible type")
             elif isinstance(type_constructor, UFDLType):
-                if not type_constructor.is_subtype_of(UFDLJSONType()):
+                if not is_subtype(type_constructor, UFDLJSONType()):
                     raise ValueError(f"Input type must be a JSON-compatible type")
             else:
                 raise ValueError("All input constructors must be type-constructors or types")
 
-        self._name = ""
         self._type_constructors = type_constructors
         self._help = help
+        self._dependencies = frozenset(
+            dependency
+            for type_constructor in type_constructors
+            if isinstance(type_constructor, TypeConstructor)
+            for dependency in type_constructor.dependencies
+        )
+
+        # Inputs are shared between all contracts with the same types for the dependencies
+        self._construction_cache: LRUCache[Hashable, Input] = LRUCache(self.CONSTRUCTION_CACHE_SIZE)
 
     @property
-    def name(self):
-        return self._name
+    def name(self) -> str:
+        return getattr(self, "_name", "")
 
     @property
     def type_constructors(self):
@@ -35,9 +50,43 @@ class InputConstructor:
     def help(self):
         return self._help
 
-    def construct(self, types: Dict[str, UFDLType]):
+    def _set_name(self, name: str):
+        """
+        Sets the name of the input this constructor constructs. Called once the
+        constructor is attached to a contract class.
+        """
+        current_name = getattr(self, "_name", None)
+        if current_name is None:
+            self._name = name
+        elif current_name != name:
+            raise ValueError(f"Constructor is already named '{current_name}', can't rename to '{name}'")
+
+    @property
+    def dependencies(self) -> FrozenSet[str]:
+        """
+        The names of the parameters that the constructed type depends on.
+        """
+        return self._dependencies
+
+    def bound_str(self) -> str:
+        """
+        Returns a string-representation of the types this constructor constructs.
+        """
+        return " | ".join(
+            type_constructor.bound_str() if isinstance(type_constructor, TypeConstructor)
+            else str(type_constructor)
+            for type_constructor in self._type_constructors
+        )
+
+    def construct(self, types: Dict[str, UFDLType]) -> Input:
+        return self._construction_cache.get_or_create(
+            types_key({dependency: types[dependency] for dependency in self._dependencies}),
+            lambda: self._construct(types)
+        )
+
+    def _construct(self, types: Dict[str, UFDLType]) -> Input:
         return Input(
-            self._name,
+            self.name,
             *(
                 input_constructor.construct(types) if isinstance(input_constructor, TypeConstructor)
                 else input_constructor
@@ -0,0 +1,35 @@
+from typing import Any, List, Tuple
+
+from ufdl.jobtypes.base import UFDLJSONType
+
+
+class InputValidator:
+    """
+    Validator/decoder for the JSON values of an input, compiled once per input.
+    A value is decoded by the first of the input's types, in declared order, which
+    accepts it. Nothing is remembered between values, as whether a type accepts a
+    value may depend on server state (e.g. whether a primary-key exists yet).
+    """
+    __slots__ = ("_types", "_parsers")
+
+    def __init__(self, *types: UFDLJSONType):
+        self._types: Tuple[UFDLJSONType, ...] = types
+        self._parsers = tuple(input_type.parse_json_value for input_type in types)
+
+    def __call__(self, value: Any) -> Tuple[UFDLJSONType, Any]:
+        """
+        Validates and decodes a JSON value.
+
+        :param value:
+                    The JSON value.
+        :return:
+                    The type which accepted the value, and the decoded value.
+        """
+        reasons: List[str] = []
+        for input_type, parse in zip(self._types, self._parsers):
+            try:
+                return input_type, parse(value)
+            except Exception as e:
+                reasons.append(f"{input_type}: {e}")
+
+        raise ValueError(f"Value {value!r} is not accepted by any type ({'; '.join(reasons)})")
@@ -0,0 +1,45 @@
+from typing import TYPE_CHECKING, Dict, Iterator, Mapping, TypeVar
+
+if TYPE_CHECKING:
+    from ._UFDLJobContract import UFDLJobContract
+
+ConstructorType = TypeVar('ConstructorType')
+IOType = TypeVar('IOType')
+
+
+class LazyIOMapping(Mapping[str, IOType]):
+    """
+    Read-only view of the inputs/outputs of a contract, by name, which constructs
+    each input/output the first time it is accessed. Constructed inputs/outputs
+    are stored on the contract, not the view, so views are cheap to create and
+    don't keep anything alive but the contract.
+    """
+    __slots__ = ("_contract", "_constructors", "_positions")
+
+    def __init__(
+            self,
+            contract: 'UFDLJobContract',
+            constructors: Dict[str, ConstructorType],
+            positions: Dict[str, int]
+    ):
+        self._contract = contract
+        self._constructors = constructors
+        self._positions = positions
+
+    def is_materialised(self, name: str) -> bool:
+        """
+        Whether the named input/output has been constructed yet.
+        """
+        return self._contract._is_io_constructed(self._positions[name])
+
+    def __getitem__(self, name: str) -> IOType:
+        return self._contract._get_io(self._positions[name], self._constructors[name])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._constructors)
+
+    def __len__(self):
+        return len(self._constructors)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._constructors
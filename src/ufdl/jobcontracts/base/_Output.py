@@ -1,10 +1,16 @@
 import builtins
-from typing import Any, Generic
+from typing import IO, Any, Generic, Iterable, Union
 
 from ufdl.jobtypes.base import UFDLType, OutputType
 
+from .._immutable import Immutable
+from ..cache import type_key
+from ..sink import DEFAULT_CHUNK_SIZE, OutputSink
+
+
+class Output(Immutable, Generic[OutputType]):
+    __slots__ = ("_name", "_type", "_help", "_hash")
 
-class Output(Generic[OutputType]):
     def __init__(self, name: str, type: UFDLType[tuple, Any, OutputType], *, help: str):
         if not isinstance(type, UFDLType):
             raise ValueError(f"All output types must be UFDL types, received: ({builtins.type(type)}) {type}")
@@ -24,3 +30,38 @@ class Output(Generic[OutputType]):
     @property
     def help(self):
         return self._help
+
+    def stream(
+            self,
+            source: Union[bytes, IO[bytes], Iterable[bytes]],
+            sink: OutputSink,
+            *,
+            chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> OutputSink:
+        """
+        Streams a binary value for this output to a sink, with bounded memory use.
+        The value is committed if it is streamed in full, and discarded otherwise.
+
+        :param source:
+                    The value in full, a binary file-like object to read it from,
+                    or an iterable of its chunks.
+        :param sink:
+                    The sink to write the value to.
+        :param chunk_size:
+                    The size of the chunks to read from a file-like object.
+        :return:
+                    The sink, for its byte-count and checksum.
+        """
+        with sink:
+            sink.consume(source, chunk_size)
+
+        return sink
+
+    def _key(self):
+        return self._name, type_key(self._type), self._help
+
+    def __eq__(self, other):
+        return self is other or (isinstance(other, Output) and self._key() == other._key())
+
+    def __hash__(self):
+        return self._get_lazily("_hash", lambda: hash(self._key()))
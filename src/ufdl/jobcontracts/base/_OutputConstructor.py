@@ -1,25 +1,38 @@
-from typing import Dict, TypeVar, Union
+from typing import Dict, FrozenSet, Hashable, Optional, TypeVar, Union
 
 from ufdl.jobtypes.base import UFDLType
 
+from .._immutable import Immutable
+from ..cache import LRUCache, types_key
 from ..params import TypeConstructor
 from ._Output import Output
 
 OutputType = TypeVar('OutputType')
 
 
-class OutputConstructor:
+class OutputConstructor(Immutable):
+    __slots__ = ("_name", "_type_constructor", "_help", "_dependencies", "_construction_cache")
+
+    # The maximum number of constructed outputs cached by each constructor
+    CONSTRUCTION_CACHE_SIZE: Optional[int] = 128
+
     def __init__(self, type_constructor: Union[UFDLType, TypeConstructor], *, help: str):
         if not isinstance(type_constructor, TypeConstructor) and not isinstance(type_constructor, UFDLType):
             raise ValueError("All output constructors must be type-constructors or types")
 
-        self._name = ""
         self._type_constructor = type_constructor
         self._help = help
+        self._dependencies = frozenset(
+            type_constructor.dependencies if isinstance(type_constructor, TypeConstructor)
+            else ()
+        )
+
+        # Outputs are shared between all contracts with the same types for the dependencies
+        self._construction_cache: LRUCache[Hashable, Output] = LRUCache(self.CONSTRUCTION_CACHE_SIZE)
 
     @property
-    def name(self):
-        return self._name
+    def name(self) -> str:
+        return getattr(self, "_name", "")
 
     @property
     def type_constructor(self):
@@ -29,10 +42,44 @@ class OutputConstructor:
     def help(self):
         return self._help
 
-    def construct(self, types: Dict[str, UFDLType]):
+    def _set_name(self, name: str):
+        """
+        Sets the name of the output this constructor constructs. Called once the
+        constructor is attached to a contract class.
+        """
+        current_name = getattr(self, "_name", None)
+        if current_name is None:
+            self._name = name
+        elif current_name != name:
+            raise ValueError(f"Constructor is already named '{current_name}', can't rename to '{name}'")
+
+    @property
+    def dependencies(self) -> FrozenSet[str]:
+        """
+        The names of the parameters that the constructed type depends on.
+        """
+        return self._dependencies
+
+    def bound_str(self) -> str:
+        """
+        Returns a string-representation of the type this constructor constructs.
+        """
+        type_constructor = self._type_constructor
+        return (
+            type_constructor.bound_str() if isinstance(type_constructor, TypeConstructor)
+            else str(type_constructor)
+        )
+
+    def construct(self, types: Dict[str, UFDLType]) -> Output:
+        return self._construction_cache.get_or_create(
+            types_key({dependency: types[dependency] for dependency in self._dependencies}),
+            lambda: self._construct(types)
+        )
+
+    def _construct(self, types: Dict[str, UFDLType]) -> Output:
         type_constructor = self._type_constructor
         return Output(
-            self._name,
+            self.name,
             (
                 type_constructor.construct(types) if isinstance(type_constructor, TypeConstructor)
                 else type_constructor
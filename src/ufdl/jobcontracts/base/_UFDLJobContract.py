@@ -1,24 +1,39 @@
+import hashlib
 from abc import ABC
-from typing import Dict
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple, Union
 
 from ufdl.jobtypes.base import UFDLType
 from ufdl.jobtypes.error import expect
+from ufdl.jobtypes.util import parse_type
 
-from ..initialise import name_type_translate
-from ..params import JobContractParams
+from .._immutable import LAZY_INITIALISATION_LOCK, Immutable
+from ..cache import CONTRACT_TYPES_CACHE, interned_types_key, is_subtype, types_key
+from ..initialise import REGISTRY, name_type_translate
+from ..instrumentation import instrumented
+from ..params import JobContractParams, TypeConstructor
 from ._Input import Input
 from ._InputConstructor import InputConstructor
+from ._LazyIOMapping import LazyIOMapping
 from ._Output import Output
 from ._OutputConstructor import OutputConstructor
 
 
-class UFDLJobContract(ABC):
+# The version of the serialised form of contracts
+SERIALISATION_VERSION = 1
+
+
+class UFDLJobContract(Immutable, ABC):
     """
     TODO
     """
+    __slots__ = ("_types", "_key", "_hash", "_io", "_format_cache", "__weakref__")
+
     _params: JobContractParams
     _input_constructors: Dict[str, InputConstructor]
     _output_constructors: Dict[str, OutputConstructor]
+    _input_positions: Dict[str, int]
+    _output_positions: Dict[str, int]
 
     def __init_subclass__(cls, **kwargs):
         params = expect(JobContractParams, kwargs.pop('params'))
@@ -30,18 +45,31 @@ class UFDLJobContract(ABC):
                 raise ValueError("All input names must be valid identifiers")
             if not isinstance(input_constructor, InputConstructor):
                 raise ValueError(f"Input '{input_name}' is not an {InputConstructor.__name__}")
-            input_constructor._name = input_name
+            input_constructor._set_name(input_name)
 
         for output_name, output_constructor in output_constructors.items():
             if not isinstance(output_name, str) or not output_name.isidentifier():
                 raise ValueError("All output names must be valid identifiers")
             if not isinstance(output_constructor, OutputConstructor):
                 raise ValueError(f"Output '{output_name}' is not an {OutputConstructor.__name__}")
-            output_constructor._name = output_name
+            output_constructor._set_name(output_name)
+
+        params._set_owner(cls)
 
         cls._params = params
         cls._input_constructors = input_constructors
         cls._output_constructors = output_constructors
+        cls._class_format_cache = {}
+
+        # Position of each input, then each output, in the list of constructed inputs/outputs
+        cls._input_positions = {
+            input_name: position
+            for position, input_name in enumerate(input_constructors)
+        }
+        cls._output_positions = {
+            output_name: position
+            for position, output_name in enumerate(output_constructors, len(input_constructors))
+        }
 
     @classmethod
     def params(cls):
@@ -63,63 +91,348 @@ class UFDLJobContract(ABC):
         return name
 
     @classmethod
-    def format(cls):
-        return f"{cls.contract_class_name()}{cls._params}"
+    def format(cls, *, include_io: bool = False) -> str:
+        """
+        Formats the signature of this contract class.
+
+        :param include_io:
+                    Whether to include the inputs and outputs of the contract.
+        :return:
+                    The formatted signature.
+        """
+        if not include_io:
+            return _cached_format(
+                cls._class_format_cache,
+                "class",
+                lambda: f"{cls.contract_class_name()}{cls._params}"
+            )
+
+        return _cached_format(
+            cls._class_format_cache,
+            "class_io",
+            lambda: _format_with_io(
+                cls.format(),
+                {
+                    input_name: input_constructor.bound_str()
+                    for input_name, input_constructor in cls._input_constructors.items()
+                },
+                {
+                    output_name: output_constructor.bound_str()
+                    for output_name, output_constructor in cls._output_constructors.items()
+                }
+            )
+        )
+
+    @classmethod
+    def class_signature(cls) -> str:
+        """
+        Gets a string which changes whenever the definition of this contract class
+        (its parameters, inputs or outputs) changes.
+        """
+        inputs = ", ".join(
+            f"{input_name}: {input_constructor.bound_str()}"
+            for input_name, input_constructor in cls._input_constructors.items()
+        )
+        outputs = ", ".join(
+            f"{output_name}: {output_constructor.bound_str()}"
+            for output_name, output_constructor in cls._output_constructors.items()
+        )
+        return f"{cls.format()}({inputs}) -> {{{outputs}}}"
+
+    def __new__(cls, types: Dict[str, UFDLType]):
+        # Return the interned instance if this contract has been constructed before
+        if isinstance(types, dict) and all(isinstance(type, UFDLType) for type in types.values()):
+            cached = CONTRACT_TYPES_CACHE.get((cls, types_key(types)))
+            if cached is not None:
+                return cached
 
+        return super().__new__(cls)
+
+    @instrumented("UFDLJobContract.__init__")
     def __init__(
             self,
             types: Dict[str, UFDLType]
     ):
-        # Make sure types really is a dict
-        expect(dict, types)
-
-        # Make sure all parameters are specified and are types
-        for param_name in self._params.names():
-            if param_name not in types:
-                raise ValueError(f"Contract {self.format()} missing type-argument \"{param_name}\"")
-            expect(UFDLType, types[param_name])
-
-        # Make sure only the parameters are specified
-        for name in types:
-            if name not in self._params:
-                raise ValueError(f"Contract {self.format()} given unknown type-argument \"{name}\"")
-
-        # Attempting to fix all bounds will check for type correctness
-        self.params().get_new_bounds_for_fixed(**{
-            str(param_name): param_type
-            for param_name, param_type in types.items()
-        })
-
-        inputs: Dict[str, Input] = {
-            input_name: input_constructor.construct(types)
-            for input_name, input_constructor in self._input_constructors.items()
-        }
+        # Interned instances are already initialised
+        if hasattr(self, "_types"):
+            return
 
-        outputs: Dict[str, Output] = {
-            output_name: output_constructor.construct(types)
-            for output_name, output_constructor in self._output_constructors.items()
-        }
+        self._initialise(types)
+
+    @classmethod
+    def instantiate_many(
+            cls,
+            types_list: Iterable[Dict[str, UFDLType]]
+    ) -> Tuple[List[Optional['UFDLJobContract']], Dict[int, Exception]]:
+        """
+        Instantiates this contract for a number of type-argument assignments at once.
+        Identical assignments are only validated once, and inputs/outputs which depend
+        on the same type-arguments are shared between the instantiated contracts.
+
+        :param types_list:
+                    The type-arguments for each contract to instantiate.
+        :return:
+                    The instantiated contracts, in order, with None in place of any
+                    contract which failed to instantiate, and a map from the index of
+                    each failed contract to the error that occurred.
+        """
+        instantiated: Dict[Hashable, Union['UFDLJobContract', Exception]] = {}
+        results: List[Optional[UFDLJobContract]] = []
+        errors: Dict[int, Exception] = {}
+
+        for index, types in enumerate(types_list):
+            try:
+                key = types_key(expect(dict, types))
+            except Exception as e:
+                key, result = None, e
+            else:
+                result = instantiated.get(key, None)
+
+            if result is None:
+                result = CONTRACT_TYPES_CACHE.get((cls, key))
+                if result is None:
+                    try:
+                        result = super().__new__(cls)
+                        result._initialise(types)
+                    except Exception as e:
+                        result = e
+                instantiated[key] = result
+
+            if isinstance(result, Exception):
+                results.append(None)
+                errors[index] = result
+            else:
+                results.append(result)
+
+        return results, errors
+
+    @classmethod
+    def infer(
+            cls,
+            *,
+            inputs: Optional[Dict[str, UFDLType]] = None,
+            outputs: Optional[Dict[str, UFDLType]] = None
+    ) -> 'UFDLJobContract':
+        """
+        Instantiates the most specific version of this contract which accepts/produces
+        the given concrete input/output types, inferring the type-arguments from them.
+
+        :param inputs:
+                    The concrete types of (some of) the inputs, by input name.
+        :param outputs:
+                    The concrete types of (some of) the outputs, by output name.
+        :return:
+                    The inferred contract.
+        """
+        observations: List[Tuple[Union[UFDLType, TypeConstructor], UFDLType]] = []
 
-        self._inputs = inputs
-        self._outputs = outputs
-        self._types = types
+        for input_name, input_type in (inputs or {}).items():
+            input_constructor = cls._input_constructors.get(input_name, None)
+            if input_constructor is None:
+                raise ValueError(f"Contract {cls.format()} has no input \"{input_name}\"")
+            expect(UFDLType, input_type)
+
+            # Use the first of the input's type-constructors which could have constructed the type
+            for type_constructor in input_constructor.type_constructors:
+                if isinstance(type_constructor, TypeConstructor):
+                    try:
+                        type_constructor.extract_dependency_types(input_type)
+                    except ValueError:
+                        continue
+                elif not is_subtype(input_type, type_constructor):
+                    continue
+                observations.append((type_constructor, input_type))
+                break
+            else:
+                raise ValueError(f"Type {input_type} is not accepted by input \"{input_name}\" of {cls.format()}")
+
+        for output_name, output_type in (outputs or {}).items():
+            output_constructor = cls._output_constructors.get(output_name, None)
+            if output_constructor is None:
+                raise ValueError(f"Contract {cls.format()} has no output \"{output_name}\"")
+            observations.append((output_constructor.type_constructor, expect(UFDLType, output_type)))
+
+        return cls(cls._params.infer_types(*observations))
+
+    @classmethod
+    def enumerate_contracts(cls, catalogue: Dict[str, Iterable[UFDLType]]) -> List['UFDLJobContract']:
+        """
+        Instantiates every valid version of this contract whose type-arguments
+        are drawn from a catalogue of candidate types.
+
+        :param catalogue:
+                    The candidate types for (some of) the parameters, by parameter name.
+        :return:
+                    The valid contracts.
+        """
+        contracts, _ = cls.instantiate_many(cls._params.enumerate_types(catalogue))
+
+        return [
+            contract
+            for contract in contracts
+            if contract is not None
+        ]
+
+    def _initialise(
+            self,
+            types: Dict[str, UFDLType],
+            validate: bool = True
+    ):
+        """
+        Initialises a new contract instance.
+
+        :param types:
+                    The type-arguments to the contract.
+        :param validate:
+                    Whether to check the type-arguments are correct. Should only be
+                    False if they are already known to be.
+        """
+        if validate:
+            # Make sure types really is a dict
+            expect(dict, types)
+
+            # Make sure all parameters are specified and are types
+            for param_name in self._params.names():
+                if param_name not in types:
+                    raise ValueError(f"Contract {self.format()} missing type-argument \"{param_name}\"")
+                expect(UFDLType, types[param_name])
+
+            # Make sure only the parameters are specified
+            for name in types:
+                if name not in self._params:
+                    raise ValueError(f"Contract {self.format()} given unknown type-argument \"{name}\"")
+
+            # Attempting to fix all bounds will check for type correctness
+            self.params().get_new_bounds_for_fixed(**{
+                str(param_name): param_type
+                for param_name, param_type in types.items()
+            })
+
+        # The structural identity of the contract is fixed at construction
+        key = self._key = interned_types_key(types)
+
+        # The type-arguments are stored in the order of their names in the key. Inputs/outputs
+        # and formatted strings are only stored once first accessed
+        self._types = tuple(types[param_name] for param_name, _ in key)
+        self._hash = hash((type(self), key))
+
+        CONTRACT_TYPES_CACHE.put((type(self), key), self)
+
+    def _get_io(self, position: int, constructor: Union[InputConstructor, OutputConstructor]) -> Union[Input, Output]:
+        """
+        Gets an input/output of this contract, constructing it on first access.
+
+        :param position:
+                    The position of the input/output in the list of constructed inputs/outputs.
+        :param constructor:
+                    The constructor of the input/output.
+        :return:
+                    The input/output.
+        """
+        constructed = self._get_lazily(
+            "_io",
+            lambda: [None] * (len(self._input_constructors) + len(self._output_constructors))
+        )
+
+        io = constructed[position]
+        if io is None:
+            io = constructor.construct(self._types_dict())
+            with LAZY_INITIALISATION_LOCK:
+                if constructed[position] is None:
+                    constructed[position] = io
+                else:
+                    io = constructed[position]
+
+        return io
+
+    def _is_io_constructed(self, position: int) -> bool:
+        """
+        Whether the input/output at the given position has been constructed yet.
+        """
+        return getattr(self, "_io", None) is not None and self._io[position] is not None
 
     @property
-    def inputs(self):
-        return self._inputs
+    def inputs(self) -> LazyIOMapping[Input]:
+        return LazyIOMapping(self, self._input_constructors, self._input_positions)
+
+    @property
+    def outputs(self) -> LazyIOMapping[Output]:
+        return LazyIOMapping(self, self._output_constructors, self._output_positions)
+
+    def materialise(self):
+        """
+        Constructs all inputs and outputs of this contract which have not yet been
+        accessed. They are otherwise constructed individually on first access.
+        """
+        for input_name, input_constructor in self._input_constructors.items():
+            self._get_io(self._input_positions[input_name], input_constructor)
+        for output_name, output_constructor in self._output_constructors.items():
+            self._get_io(self._output_positions[output_name], output_constructor)
 
     @property
-    def outputs(self):
-        return self._outputs
+    def types(self) -> Mapping[str, UFDLType]:
+        return MappingProxyType(self._types_dict())
+
+    def _types_dict(self) -> Dict[str, UFDLType]:
+        """
+        Gets the type-arguments of this contract, by parameter name.
+        """
+        return {
+            param_name: param_type
+            for (param_name, _), param_type in zip(self._key, self._types)
+        }
 
     @property
-    def types(self):
-        return self._types
+    def key(self) -> Hashable:
+        """
+        A hashable identity of the type-arguments of this contract, which is equal
+        for structurally-equal contracts of the same class.
+        """
+        return self._key
 
     def format_type_args(self) -> str:
+        return _cached_format(self._get_format_cache(), "type_args", lambda: self._format_type_args(self._types_dict()))
+
+    def formatted(self, *, include_io: bool = False) -> str:
+        """
+        Formats this contract.
+
+        :param include_io:
+                    Whether to include the types of the inputs and outputs of the contract.
+        :return:
+                    The formatted contract.
+        """
+        if not include_io:
+            return _cached_format(
+                self._get_format_cache(),
+                "contract",
+                lambda: f"{self.contract_class_name()}{self.format_type_args()}"
+            )
+
+        return _cached_format(
+            self._get_format_cache(),
+            "contract_io",
+            lambda: _format_with_io(
+                self.formatted(),
+                {
+                    input_name: " | ".join(map(str, input.types))
+                    for input_name, input in self.inputs.items()
+                },
+                {
+                    output_name: str(output.type)
+                    for output_name, output in self.outputs.items()
+                }
+            )
+        )
+
+    def _get_format_cache(self) -> Dict[str, Any]:
+        return self._get_lazily("_format_cache", dict)
+
+    @classmethod
+    def _format_type_args(cls, types: Dict[str, UFDLType]) -> str:
         args = tuple(
-            self._types[param.name]
-            for param in self._params
+            types[param.name]
+            for param in cls._params
         )
 
         if len(args) == 0:
@@ -127,6 +440,61 @@ class UFDLJobContract(ABC):
 
         return f"<{', '.join(str(arg) for arg in args)}>"
 
+    @instrumented("UFDLJobContract.validate_inputs")
+    def validate_inputs(self, values: Dict[str, Any]) -> Dict[str, Tuple[UFDLType, Any]]:
+        """
+        Validates and decodes the JSON values of all inputs of a job.
+
+        :param values:
+                    The JSON value of each input, by input name.
+        :return:
+                    The type which accepted the value, and the decoded value, of each input.
+        """
+        expect(dict, values)
+
+        for input_name in values:
+            if input_name not in self._input_constructors:
+                raise ValueError(f"Contract {self} has no input \"{input_name}\"")
+
+        decoded: Dict[str, Tuple[UFDLType, Any]] = {}
+        for input_name in self._input_constructors:
+            if input_name not in values:
+                raise ValueError(f"Missing value for input \"{input_name}\"")
+            try:
+                decoded[input_name] = self.inputs[input_name].parse_value(values[input_name])
+            except ValueError as e:
+                raise ValueError(f"Invalid value for input \"{input_name}\": {e}") from e
+
+        return decoded
+
+    def validate_inputs_many(
+            self,
+            values_list: Iterable[Dict[str, Any]]
+    ) -> Tuple[List[Optional[Dict[str, Tuple[UFDLType, Any]]]], Dict[int, Exception]]:
+        """
+        Validates and decodes the input values of a number of jobs at once. Each input
+        compiles its validator once, and repeated values are only decoded once.
+
+        :param values_list:
+                    The JSON values of the inputs of each job.
+        :return:
+                    The decoded inputs of each job, in order, with None in place of any
+                    job whose values failed to validate, and a map from the index of
+                    each failed job to the error that occurred.
+        """
+        results: List[Optional[Dict[str, Tuple[UFDLType, Any]]]] = []
+        errors: Dict[int, Exception] = {}
+
+        for index, values in enumerate(values_list):
+            try:
+                results.append(self.validate_inputs(values))
+            except Exception as e:
+                results.append(None)
+                errors[index] = e
+
+        return results, errors
+
+    @instrumented("UFDLJobContract.is_subtype_of")
     def is_subtype_of(self, other: 'UFDLJobContract') -> bool:
         """
         Checks if this contract can be used in place of another contract.
@@ -139,15 +507,189 @@ class UFDLJobContract(ABC):
         return (
                 type(self) is type(other)
                 and all(
-                    other_type.is_subtype_of(self_type)
+                    is_subtype(other_type, self_type)
                     for input_name in self.inputs.keys()
                     for self_type, other_type in zip(self.inputs[input_name].types, other.inputs[input_name].types)
                 )
                 and all(
-                    self.outputs[output_name].type.is_subtype_of(other.outputs[output_name].type)
+                    is_subtype(self.outputs[output_name].type, other.outputs[output_name].type)
                     for output_name in self.outputs.keys()
                 )
         )
 
+    def signature(self) -> str:
+        """
+        Gets a stamp which identifies this contract along with the version of its
+        class definition and of the serialised form.
+        """
+        return self._signature(self.class_signature(), self.format_type_args())
+
+    @staticmethod
+    def _signature(class_signature: str, formatted_type_args: str) -> str:
+        return hashlib.sha256(
+            f"{SERIALISATION_VERSION}\n{class_signature}\n{formatted_type_args}".encode("utf-8")
+        ).hexdigest()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts this contract to a JSON-compatible dictionary.
+        """
+        types = self._types_dict()
+        return {
+            "contract": self.contract_class_name(),
+            "types": {
+                param.name: str(types[param.name])
+                for param in self._params
+            },
+            "inputs": {
+                input_name: {
+                    "types": [str(input_type) for input_type in input.types],
+                    "help": input.help
+                }
+                for input_name, input in self.inputs.items()
+            },
+            "outputs": {
+                output_name: {
+                    "type": str(output.type),
+                    "help": output.help
+                }
+                for output_name, output in self.outputs.items()
+            },
+            "signature": self.signature()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], *, trusted: bool = False) -> 'UFDLJobContract':
+        """
+        Converts a dictionary created by to_dict back into a contract.
+
+        :param data:
+                    The dictionary form of the contract.
+        :param trusted:
+                    Whether the dictionary comes from a trusted source. If so, and its
+                    signature matches the local definition of the contract class, the
+                    type-arguments are not re-validated.
+        :return:
+                    The contract.
+        """
+        expect(dict, data)
+
+        contract_name = data.get("contract", None)
+        contract_cls = name_type_translate(contract_name) if isinstance(contract_name, str) else None
+        if contract_cls is None:
+            raise ValueError(f"Unknown contract-name \"{contract_name}\"")
+        if not issubclass(contract_cls, cls):
+            raise ValueError(f"Contract {contract_name} is not a {cls.__name__} contract")
+
+        type_strings = expect(dict, data.get("types", None))
+        types = {
+            param_name: parse_type(expect(str, type_string))
+            for param_name, type_string in type_strings.items()
+        }
+
+        if trusted and set(types) == set(contract_cls._params.names()):
+            formatted_type_args = contract_cls._format_type_args(types)
+            if data.get("signature", None) == cls._signature(contract_cls.class_signature(), formatted_type_args):
+                return contract_cls._instantiate_trusted(types)
+
+        return contract_cls(types)
+
+    @classmethod
+    def _instantiate_trusted(cls, types: Dict[str, UFDLType]) -> 'UFDLJobContract':
+        """
+        Instantiates this contract without validating the type-arguments.
+        """
+        contract = CONTRACT_TYPES_CACHE.get((cls, types_key(types)))
+        if contract is None:
+            contract = super().__new__(cls)
+            contract._initialise(types, validate=False)
+        return contract
+
+    def __reduce__(self):
+        # Pickle as the class (by reference) and the type-arguments as strings
+        types = self._types_dict()
+        return _unpickle_contract, (
+            type(self),
+            tuple(
+                (param.name, str(types[param.name]))
+                for param in self._params
+            )
+        )
+
+    def __eq__(self, other):
+        return self is other or (
+            type(self) is type(other)
+            and self._hash == other._hash
+            and self._key == other._key
+        )
+
+    def __hash__(self):
+        return self._hash
+
     def __str__(self):
-        return f"{self.contract_class_name()}{self.format_type_args()}"
+        return self.formatted()
+
+
+def _unpickle_contract(
+        contract_cls: type,
+        type_strings: Tuple[Tuple[str, str], ...]
+) -> UFDLJobContract:
+    """
+    Recreates a pickled contract, returning the interned instance if there is one.
+    Pickled data is already trusted to execute code, so the type-arguments are not
+    re-validated.
+
+    :param contract_cls:
+                The class of the contract.
+    :param type_strings:
+                The name and formatted type of each type-argument.
+    :return:
+                The contract.
+    """
+    return contract_cls._instantiate_trusted({
+        param_name: parse_type(type_string)
+        for param_name, type_string in type_strings
+    })
+
+
+def _cached_format(cache: Dict[str, Any], kind: str, format: Callable[[], str]) -> str:
+    """
+    Gets a formatted string from a cache, formatting and caching it if it isn't
+    already cached. The cache is emptied whenever the contract registry changes,
+    as contract names may have changed.
+
+    :param cache:
+                The cache of formatted strings.
+    :param kind:
+                The kind of formatted string to get.
+    :param format:
+                Function which formats the string.
+    :return:
+                The formatted string.
+    """
+    version = REGISTRY.version
+    if cache.get("version", None) != version:
+        cache.clear()
+        cache["version"] = version
+
+    formatted = cache.get(kind, None)
+    if formatted is None:
+        formatted = cache[kind] = format()
+    return formatted
+
+
+def _format_with_io(header: str, inputs: Dict[str, str], outputs: Dict[str, str]) -> str:
+    """
+    Formats a contract (class) along with its formatted inputs and outputs.
+    """
+    formatted_inputs = ",\n".join(
+        f"\t{input_name}: {input}"
+        for input_name, input in inputs.items()
+    )
+
+    formatted_outputs = ",\n".join(
+        f"\t{output_name}: {output}"
+        for output_name, output in outputs.items()
+    )
+
+    return f"{header}(\n{formatted_inputs}\n) -> {{\n{formatted_outputs}\n}}"
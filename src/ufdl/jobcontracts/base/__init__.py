@@ -1,5 +1,7 @@
 from ._Input import Input
 from ._InputConstructor import InputConstructor
+from ._InputValidator import InputValidator
+from ._LazyIOMapping import LazyIOMapping
 from ._Output import Output
 from ._OutputConstructor import OutputConstructor
 from ._UFDLJobContract import UFDLJobContract
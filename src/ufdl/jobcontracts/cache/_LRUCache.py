@@ -0,0 +1,156 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Iterator, Optional, Tuple, TypeVar
+
+KeyType = TypeVar('KeyType', bound=Hashable)
+ValueType = TypeVar('ValueType')
+
+
+class LRUCache(Generic[KeyType, ValueType]):
+    """
+    A bounded mapping which evicts the least-recently-used entry once
+    its maximum size is exceeded, and which keeps count of the hits and
+    misses against it. Safe to share between threads.
+    """
+    def __init__(self, max_size: Optional[int] = 128):
+        self._entries: OrderedDict[KeyType, ValueType] = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_size: Optional[int] = None
+        self._hits: int = 0
+        self._misses: int = 0
+        self.max_size = max_size
+
+    @property
+    def max_size(self) -> Optional[int]:
+        """
+        The maximum number of entries held by the cache. None means unbounded.
+        """
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, value: Optional[int]):
+        if value is not None and value < 0:
+            raise ValueError(f"Cache size must be non-negative, got {value}")
+        with self._lock:
+            self._max_size = value
+            self._evict()
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def get(self, key: KeyType, default: Optional[ValueType] = None) -> Optional[ValueType]:
+        """
+        Gets the value cached under the given key, marking it as recently used.
+
+        :param key:
+                    The key to look up.
+        :param default:
+                    The value to return if the key is not cached.
+        :return:
+                    The cached value, or the default.
+        """
+        with self._lock:
+            entries = self._entries
+            if key in entries:
+                entries.move_to_end(key)
+                self._hits += 1
+                return entries[key]
+            self._misses += 1
+            return default
+
+    def get_or_create(self, key: KeyType, create: Callable[[], ValueType]) -> ValueType:
+        """
+        Gets the value cached under the given key, creating (and caching) it
+        if it is not already present.
+
+        :param key:
+                    The key to look up.
+        :param create:
+                    Function which creates the value if it isn't cached.
+        :return:
+                    The cached or newly-created value.
+        """
+        with self._lock:
+            entries = self._entries
+            if key in entries:
+                entries.move_to_end(key)
+                self._hits += 1
+                return entries[key]
+            self._misses += 1
+
+        # The value is created without holding the lock, as creation may use the cache
+        value = create()
+        self.put(key, value)
+        return value
+
+    def put(self, key: KeyType, value: ValueType):
+        """
+        Caches a value under the given key.
+
+        :param key:
+                    The key to cache the value under.
+        :param value:
+                    The value to cache.
+        """
+        with self._lock:
+            if self._max_size == 0:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def clear(self):
+        """
+        Removes all entries from the cache. Statistics are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def reset_statistics(self):
+        """
+        Resets the hit/miss counters.
+        """
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+    def info(self) -> Tuple[int, int, Optional[int], int]:
+        """
+        Gets the statistics of the cache.
+
+        :return:
+                    The hits, misses, maximum size and current size of the cache.
+        """
+        with self._lock:
+            return self._hits, self._misses, self._max_size, len(self._entries)
+
+    def values(self) -> Iterator[ValueType]:
+        """
+        Iterates over the cached values, least-recently-used first,
+        without affecting their recency. The values are those cached when
+        iteration begins.
+        """
+        with self._lock:
+            return iter(tuple(self._entries.values()))
+
+    def _evict(self):
+        """
+        Removes the least-recently-used entries until the cache is within its
+        maximum size. Must be called with the lock held.
+        """
+        if self._max_size is None:
+            return
+        entries = self._entries
+        while len(entries) > self._max_size:
+            entries.popitem(last=False)
+
+    def __contains__(self, key: KeyType) -> bool:
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,116 @@
+import mmap
+import os
+from contextlib import contextmanager
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+# Identifies a version of a file: its real path, device, inode, modification time and size
+FileKey = Tuple[str, int, int, int, int]
+
+
+class MappedFileCache:
+    """
+    Shares read-only memory-maps of local files between their users. Each file is
+    mapped once (per version of the file) and handed out as read-only memoryviews,
+    and the map is closed once the last view is released. Separate processes which
+    map the same file share its pages through the operating system's page cache.
+    """
+    def __init__(self):
+        self._lock = Lock()
+        # File key -> [map (None for empty files), number of views]
+        self._maps: Dict[FileKey, List[Union[Optional[mmap.mmap], int]]] = {}
+        # Identity of each handed-out view -> (file key, view)
+        self._views: Dict[int, Tuple[FileKey, memoryview]] = {}
+        self._hits: int = 0
+        self._misses: int = 0
+
+    def acquire(self, path: Union[str, os.PathLike]) -> memoryview:
+        """
+        Gets a read-only view of the contents of a file. The view must be
+        released with release once it is no longer needed.
+
+        :param path:
+                    The path to the file.
+        :return:
+                    The view of the file's contents.
+        """
+        real_path = os.path.realpath(path)
+        with open(real_path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            key = (real_path, stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+            with self._lock:
+                entry = self._maps.get(key, None)
+                if entry is None:
+                    self._misses += 1
+                    mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size > 0 else None
+                    entry = self._maps[key] = [mapped, 0]
+                else:
+                    self._hits += 1
+
+                view = memoryview(entry[0] if entry[0] is not None else b"")
+                entry[1] += 1
+                self._views[id(view)] = (key, view)
+
+        return view
+
+    def release(self, view: memoryview):
+        """
+        Releases a view acquired from this cache, closing the file's
+        map if no other views of it remain.
+
+        :param view:
+                    The view to release.
+        """
+        with self._lock:
+            key, _ = self._views.get(id(view), (None, None))
+            if key is None:
+                raise ValueError("View was not acquired from this cache")
+
+            # Raises BufferError if the view is still exported, in which case
+            # it remains acquired and can be released again later
+            view.release()
+
+            del self._views[id(view)]
+            entry = self._maps[key]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._maps[key]
+                if entry[0] is not None:
+                    # Slices of released views may still be alive, in which case
+                    # the map is unmapped when they are garbage-collected instead
+                    try:
+                        entry[0].close()
+                    except BufferError:
+                        pass
+
+    @contextmanager
+    def mapped(self, path: Union[str, os.PathLike]) -> Iterator[memoryview]:
+        """
+        Context manager which acquires a read-only view of a file's
+        contents, and releases it on exit.
+
+        :param path:
+                    The path to the file.
+        :return:
+                    The view of the file's contents.
+        """
+        view = self.acquire(path)
+        try:
+            yield view
+        finally:
+            self.release(view)
+
+    def info(self) -> Tuple[int, int, int, int]:
+        """
+        Gets the statistics of the cache.
+
+        :return:
+                    The hits, misses, number of mapped files and number of outstanding views.
+        """
+        with self._lock:
+            return self._hits, self._misses, len(self._maps), len(self._views)
+
+
+# The maps of files shared by all inputs
+MAPPED_FILE_CACHE = MappedFileCache()
@@ -0,0 +1,16 @@
+from ._contract_cache import (
+    CONTRACT_STRING_CACHE,
+    CONTRACT_TYPES_CACHE,
+    clear_contract_caches,
+    contract_cache_info,
+    set_contract_cache_size
+)
+from ._LRUCache import LRUCache
+from ._type_key import interned_types_key, type_key, types_key
+from ._subtype_cache import (
+    disable_subtype_cache,
+    enable_subtype_cache,
+    is_subtype,
+    subtype_cache_info
+)
+from ._MappedFileCache import MAPPED_FILE_CACHE, MappedFileCache
@@ -0,0 +1,47 @@
+from typing import Dict, Hashable, Optional, Tuple
+
+from ..initialise import add_initialisation_hook
+from ._LRUCache import LRUCache
+
+# Contracts cached by their normalised contract-string
+CONTRACT_STRING_CACHE: LRUCache[str, 'UFDLJobContract'] = LRUCache(256)
+
+# Contracts cached by their contract class and type-arguments
+CONTRACT_TYPES_CACHE: LRUCache[Hashable, 'UFDLJobContract'] = LRUCache(256)
+
+
+def set_contract_cache_size(max_size: Optional[int]):
+    """
+    Sets the maximum number of contracts held by each of the contract caches.
+
+    :param max_size:
+                The maximum number of cached contracts, 0 to disable
+                caching, or None for no limit.
+    """
+    CONTRACT_STRING_CACHE.max_size = max_size
+    CONTRACT_TYPES_CACHE.max_size = max_size
+
+
+def clear_contract_caches():
+    """
+    Removes all cached contracts. Called automatically whenever the
+    server is (re-)initialised, as contract names may have changed.
+    """
+    CONTRACT_STRING_CACHE.clear()
+    CONTRACT_TYPES_CACHE.clear()
+
+
+def contract_cache_info() -> Dict[str, Tuple[int, int, Optional[int], int]]:
+    """
+    Gets the statistics of the contract caches.
+
+    :return:
+                A map from cache name to its (hits, misses, max size, current size).
+    """
+    return {
+        "string": CONTRACT_STRING_CACHE.info(),
+        "types": CONTRACT_TYPES_CACHE.info()
+    }
+
+
+add_initialisation_hook(clear_contract_caches)
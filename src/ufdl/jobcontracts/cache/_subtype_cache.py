@@ -0,0 +1,72 @@
+from typing import Hashable, Optional, Tuple
+
+from ufdl.jobtypes.base import UFDLType
+
+from ..initialise import add_initialisation_hook
+from ..instrumentation import instrumented
+from ._LRUCache import LRUCache
+from ._type_key import type_key
+
+# Results of sub-type checks, keyed on the identities of the compared types
+SUBTYPE_CACHE: LRUCache[Tuple[Hashable, Hashable], bool] = LRUCache(4096)
+
+# Whether sub-type checks are cached
+SUBTYPE_CACHE_ENABLED: bool = False
+
+
+@instrumented("is_subtype")
+def is_subtype(type: UFDLType, of: UFDLType) -> bool:
+    """
+    Checks if a type is a sub-type of another. All sub-type checks made by this
+    package go through this function, so that they are cached when the sub-type
+    cache is enabled.
+
+    :param type:
+                The possible sub-type.
+    :param of:
+                The possible super-type.
+    :return:
+                Whether type is a sub-type of of.
+    """
+    if not SUBTYPE_CACHE_ENABLED:
+        return type.is_subtype_of(of)
+
+    return SUBTYPE_CACHE.get_or_create(
+        (type_key(type), type_key(of)),
+        lambda: type.is_subtype_of(of)
+    )
+
+
+def enable_subtype_cache(max_size: Optional[int] = None):
+    """
+    Enables caching of sub-type checks.
+
+    :param max_size:
+                Optionally, the maximum number of cached results.
+    """
+    global SUBTYPE_CACHE_ENABLED
+    if max_size is not None:
+        SUBTYPE_CACHE.max_size = max_size
+    SUBTYPE_CACHE_ENABLED = True
+
+
+def disable_subtype_cache():
+    """
+    Disables caching of sub-type checks, and discards any cached results.
+    """
+    global SUBTYPE_CACHE_ENABLED
+    SUBTYPE_CACHE_ENABLED = False
+    SUBTYPE_CACHE.clear()
+
+
+def subtype_cache_info() -> Tuple[int, int, Optional[int], int]:
+    """
+    Gets the statistics of the sub-type cache.
+
+    :return:
+                The hits, misses, maximum size and current size of the cache.
+    """
+    return SUBTYPE_CACHE.info()
+
+
+add_initialisation_hook(SUBTYPE_CACHE.clear)
@@ -0,0 +1,65 @@
+import builtins
+from typing import Any, Dict, Hashable, Tuple
+
+from ufdl.jobtypes.base import UFDLType
+
+from ._LRUCache import LRUCache
+
+# The parts of type-mapping identities which are shared between the identities that contain them
+INTERNED_KEY_PARTS: LRUCache[Hashable, Hashable] = LRUCache(1024)
+
+
+def type_key(type: Any) -> Hashable:
+    """
+    Gets a hashable identity for a type, which is equal for
+    structurally-equal types.
+
+    :param type:
+                The type (or type-argument value) to get the identity of.
+    :return:
+                The hashable identity.
+    """
+    if not isinstance(type, UFDLType):
+        try:
+            hash(type)
+            return type
+        except TypeError:
+            return str(type)
+
+    return (
+        builtins.type(type),
+        tuple(type_key(type_arg) for type_arg in type.type_args)
+    )
+
+
+def types_key(types: Dict[str, UFDLType]) -> Tuple[Tuple[str, Hashable], ...]:
+    """
+    Gets a hashable identity for a mapping from names to types.
+
+    :param types:
+                The mapping to get the identity of.
+    :return:
+                The hashable identity.
+    """
+    return tuple(
+        (name, type_key(types[name]))
+        for name in sorted(types)
+    )
+
+
+
+def interned_types_key(types: Dict[str, UFDLType]) -> Tuple[Tuple[str, Hashable], ...]:
+    """
+    Gets the same identity as types_key, but with the identity of each named type
+    shared with any other recently-interned identities containing it, so that
+    identities which are kept for a long time hold as little memory as possible.
+
+    :param types:
+                The mapping to get the identity of.
+    :return:
+                The hashable identity.
+    """
+    return tuple(
+        INTERNED_KEY_PARTS.get_or_create(part, lambda part=part: part)
+        for part in types_key(types)
+    )
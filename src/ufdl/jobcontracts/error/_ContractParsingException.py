@@ -1,9 +1,14 @@
-from typing import Any
+from typing import Any, Optional
 
 
 class ContractParsingException(Exception):
-    def __init__(self, contract_string: str, cause: Any = None):
+    def __init__(self, contract_string: str, cause: Any = None, *, position: Optional[int] = None):
         message = f"Error parsing contract-string \"{contract_string}\""
+        if position is not None:
+            message += f" at position {position}"
         if cause is not None:
             message += f": {cause}"
         super().__init__(message)
+
+        self.contract_string = contract_string
+        self.position = position
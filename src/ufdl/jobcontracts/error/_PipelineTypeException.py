@@ -0,0 +1,16 @@
+from typing import Dict, Union
+
+
+class PipelineTypeException(Exception):
+    """
+    Exception for when a pipeline of contracts fails to type-check. Holds
+    all errors found in the pipeline, not just the first.
+    """
+    def __init__(self, errors: Dict[Union[str, tuple], Exception]):
+        message = "Pipeline failed to type-check:\n" + "\n".join(
+            f"  {location}: {error}"
+            for location, error in errors.items()
+        )
+        super().__init__(message)
+
+        self.errors = errors
@@ -1,2 +1,3 @@
 from ._ContractParsingException import ContractParsingException
 from ._UnknownContractNameException import UnknownContractNameException
+from ._PipelineTypeException import PipelineTypeException
@@ -0,0 +1,236 @@
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple, Type
+
+from ufdl.jobtypes.base import UFDLType
+
+from ..base import UFDLJobContract
+from ..cache import LRUCache, is_subtype, type_key
+
+# Key identifying a set of structurally-equal contracts
+ContractKey = Tuple[Type[UFDLJobContract], Hashable]
+
+# For each constrained parameter of a contract class, the distinct type-arguments given to it
+# (by structural key), along with the keys of the groups of contracts which were given that argument
+ArgumentIndex = Tuple[Dict[Hashable, Tuple[UFDLType, Set[Hashable]]], ...]
+
+
+class ContractIndex:
+    """
+    Index of contract instances which answers which of them can be used in place
+    of a given contract without testing every indexed contract.
+
+    Contracts are grouped by contract class and type-arguments, and each distinct
+    argument to each constrained parameter is indexed (by its structural key) to the
+    groups given that argument. A contract can only be used in place of another if
+    each of its constrained arguments is a sub-type or super-type of the other's, so
+    a query only tests the distinct arguments of each parameter for relatedness, and
+    only tests is_subtype_of on one contract of each group related in every parameter.
+    """
+    def __init__(self, contracts: Iterable[UFDLJobContract] = tuple(), *, max_cached_queries: Optional[int] = 256):
+        # Contract class -> type-arguments -> contracts
+        self._groups: Dict[Type[UFDLJobContract], Dict[Hashable, List[UFDLJobContract]]] = {}
+
+        # Contract class -> index of the arguments to its constrained parameters
+        self._arguments: Dict[Type[UFDLJobContract], ArgumentIndex] = {}
+
+        # Previously-answered queries
+        self._queries: LRUCache[ContractKey, Tuple[UFDLJobContract, Dict[ContractKey, List[UFDLJobContract]]]] = (
+            LRUCache(max_cached_queries)
+        )
+
+        self._size: int = 0
+
+        for contract in contracts:
+            self.insert(contract)
+
+    def insert(self, contract: UFDLJobContract):
+        """
+        Adds a contract to the index.
+
+        :param contract:
+                    The contract to add.
+        """
+        contract_cls = type(contract)
+        key = contract.key
+
+        groups = self._groups.setdefault(contract_cls, {})
+        group = groups.get(key, None)
+        if group is None:
+            group = groups[key] = []
+
+            # Index the arguments of the new group
+            arguments = self._arguments.get(contract_cls, None)
+            if arguments is None:
+                arguments = self._arguments[contract_cls] = tuple(
+                    {} for _ in _constrained_params(contract_cls)
+                )
+            for param_arguments, argument in zip(arguments, self._constrained_arguments(contract)):
+                param_arguments.setdefault(type_key(argument), (argument, set()))[1].add(key)
+
+        group.append(contract)
+        self._size += 1
+
+        # Incrementally update the previously-answered queries
+        for query, matches in self._queries.values():
+            if type(query) is contract_cls and contract.is_subtype_of(query):
+                matches.setdefault((contract_cls, key), []).append(contract)
+
+    def remove(self, contract: UFDLJobContract):
+        """
+        Removes a contract from the index.
+
+        :param contract:
+                    The contract to remove.
+        """
+        contract_cls = type(contract)
+        key = contract.key
+
+        try:
+            groups = self._groups[contract_cls]
+            group = groups[key]
+            index = next(
+                index
+                for index, indexed in enumerate(group)
+                if indexed is contract
+            )
+        except (KeyError, StopIteration):
+            raise KeyError(f"Contract {contract} is not in the index")
+
+        del group[index]
+        if len(group) == 0:
+            del groups[key]
+
+            # Remove the group from the index of its arguments
+            arguments = self._arguments[contract_cls]
+            for param_arguments, argument in zip(arguments, self._constrained_arguments(contract)):
+                argument_key = type_key(argument)
+                keys = param_arguments[argument_key][1]
+                keys.discard(key)
+                if len(keys) == 0:
+                    del param_arguments[argument_key]
+
+            if len(groups) == 0:
+                del self._groups[contract_cls]
+                del self._arguments[contract_cls]
+        self._size -= 1
+
+        # Incrementally update the previously-answered queries
+        for query, matches in self._queries.values():
+            matching_group = matches.get((contract_cls, key), None)
+            if matching_group is None:
+                continue
+            matching_group[:] = [indexed for indexed in matching_group if indexed is not contract]
+            if len(matching_group) == 0:
+                del matches[(contract_cls, key)]
+
+    def usable_in_place_of(self, contract: UFDLJobContract) -> List[UFDLJobContract]:
+        """
+        Gets all indexed contracts which can be used in place of the given contract.
+
+        :param contract:
+                    The contract to find substitutes for.
+        :return:
+                    The indexed contracts for which is_subtype_of(contract) holds.
+        """
+        contract_cls = type(contract)
+        query_key = (contract_cls, contract.key)
+
+        query = self._queries.get(query_key, None)
+        if query is None:
+            matches = {}
+            groups = self._groups.get(contract_cls, {})
+            for key in self._candidate_keys(contract):
+                # All contracts in a group are equal, so only test one
+                group = groups[key]
+                if group[0].is_subtype_of(contract):
+                    matches[(contract_cls, key)] = list(group)
+            query = (contract, matches)
+            self._queries.put(query_key, query)
+
+        return [
+            matching
+            for group in query[1].values()
+            for matching in group
+        ]
+
+    def _candidate_keys(self, contract: UFDLJobContract) -> Iterable[Hashable]:
+        """
+        Gets the keys of the groups whose constrained arguments are each related
+        to the corresponding argument of the given contract.
+        """
+        contract_cls = type(contract)
+        arguments = self._arguments.get(contract_cls, None)
+        if arguments is None:
+            return tuple()
+
+        candidates: Optional[Set[Hashable]] = None
+        for param_arguments, query_argument in zip(arguments, self._constrained_arguments(contract)):
+            related: Set[Hashable] = set()
+            for argument, keys in param_arguments.values():
+                if is_subtype(argument, query_argument) or is_subtype(query_argument, argument):
+                    related.update(keys)
+            candidates = related if candidates is None else candidates & related
+            if len(candidates) == 0:
+                break
+
+        # Without constrained parameters, every group is a candidate
+        return self._groups[contract_cls].keys() if candidates is None else candidates
+
+    @staticmethod
+    def _constrained_arguments(contract: UFDLJobContract) -> Tuple[UFDLType, ...]:
+        """
+        Gets the type-arguments of a contract to its constrained parameters.
+        """
+        return tuple(
+            contract.types[param_name]
+            for param_name in _constrained_params(type(contract))
+        )
+
+    def __contains__(self, contract: UFDLJobContract) -> bool:
+        group = self._groups.get(type(contract), {}).get(contract.key, [])
+        return any(indexed is contract for indexed in group)
+
+    def __iter__(self) -> Iterator[UFDLJobContract]:
+        for groups in self._groups.values():
+            for group in groups.values():
+                yield from group
+
+    def __len__(self):
+        return self._size
+
+
+# Cache of the constrained parameters of each contract class
+CONSTRAINED_PARAMS: Dict[Type[UFDLJobContract], Tuple[str, ...]] = {}
+
+
+def _constrained_params(contract_cls: Type[UFDLJobContract]) -> Tuple[str, ...]:
+    """
+    Gets the names of the parameters of a contract class which (directly or
+    indirectly) determine the types of its inputs and outputs. Only these
+    parameters constrain whether one contract can be used in place of another.
+    The parameters are given in declaration order.
+    """
+    constrained = CONSTRAINED_PARAMS.get(contract_cls, None)
+    if constrained is not None:
+        return constrained
+
+    params = contract_cls.params()
+    to_visit = [
+        dependency
+        for constructors in (contract_cls.input_constructors(), contract_cls.output_constructors())
+        for constructor in constructors.values()
+        for dependency in constructor.dependencies
+    ]
+    visited = set()
+    while len(to_visit) > 0:
+        param_name = to_visit.pop()
+        if param_name in visited:
+            continue
+        visited.add(param_name)
+        to_visit.extend(params[param_name].dependencies)
+
+    constrained = CONSTRAINED_PARAMS[contract_cls] = tuple(
+        param_name
+        for param_name in params.names()
+        if param_name in visited
+    )
+    return constrained
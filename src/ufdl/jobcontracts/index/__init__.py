@@ -0,0 +1 @@
+from ._ContractIndex import ContractIndex
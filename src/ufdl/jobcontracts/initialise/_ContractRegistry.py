@@ -0,0 +1,273 @@
+import builtins
+import threading
+from importlib.metadata import EntryPoint, entry_points
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Union
+
+from ufdl.jobtypes.error import NotInitialisedException
+
+
+class RegistrySnapshot(NamedTuple):
+    """
+    An immutable view of the contract registry at a particular version.
+    """
+    version: int
+    name_to_type: Mapping[str, type]
+    type_to_name: Mapping[type, str]
+
+
+class ContractRegistry:
+    """
+    Registry of the contract classes known by name to the server.
+
+    Changes are made to a copy of the current mappings, which is then published
+    by replacing the snapshot reference in a single assignment. Readers therefore
+    never see a partially-updated registry and never need to take a lock; writers
+    are serialised with a lock.
+
+    If an entry-point group is given, contract classes which are not registered
+    are looked up in that group when they are first translated, and only then
+    imported and registered. Discovery stops once the server has initialised the
+    registry with replace, as the server's mapping is then authoritative.
+    """
+    def __init__(self, entry_point_group: Optional[str] = None):
+        self._snapshot: Optional[RegistrySnapshot] = None
+        self._write_lock = threading.RLock()
+        self._hooks: List[Callable[[], None]] = []
+        self._next_version: int = 1
+        self._entry_point_group: Optional[str] = entry_point_group
+        self._entry_points: Optional[Dict[str, EntryPoint]] = None
+        self._authoritative: bool = False
+
+    def snapshot(self) -> RegistrySnapshot:
+        """
+        Gets the current state of the registry.
+
+        :return:
+                    The current snapshot.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            raise NotInitialisedException()
+        return snapshot
+
+    @property
+    def is_initialised(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def version(self) -> int:
+        """
+        The version of the current snapshot, or 0 if the registry is not initialised.
+        """
+        snapshot = self._snapshot
+        return 0 if snapshot is None else snapshot.version
+
+    def add_hook(self, hook: Callable[[], None]):
+        """
+        Adds a function to be called whenever a new version of the registry is published.
+
+        :param hook:
+                    The function to call.
+        """
+        with self._write_lock:
+            self._hooks.append(hook)
+
+    def replace(self, name_to_type_map: Dict[str, type]):
+        """
+        Replaces the entire contents of the registry. Contract classes are no longer
+        discovered via entry-points once the registry has been replaced.
+
+        :param name_to_type_map:
+                    The new mapping from contract name to contract class.
+        """
+        name_to_type = {}
+        type_to_name = {}
+        for name, type in name_to_type_map.items():
+            self._add(name_to_type, type_to_name, name, type)
+
+        with self._write_lock:
+            self._authoritative = True
+            self._publish(name_to_type, type_to_name)
+
+    def register(self, name: str, type: type):
+        """
+        Adds a single contract class to the registry.
+
+        :param name:
+                    The name of the contract class.
+        :param type:
+                    The contract class.
+        """
+        with self._write_lock:
+            snapshot = self._snapshot
+            name_to_type = {} if snapshot is None else dict(snapshot.name_to_type)
+            type_to_name = {} if snapshot is None else dict(snapshot.type_to_name)
+            self._add(name_to_type, type_to_name, name, type)
+            self._publish(name_to_type, type_to_name)
+
+    def unregister(self, name_or_type: Union[str, type]):
+        """
+        Removes a single contract class from the registry.
+
+        :param name_or_type:
+                    The name of the contract class, or the class itself.
+        """
+        with self._write_lock:
+            snapshot = self.snapshot()
+            if isinstance(name_or_type, str):
+                name, type = name_or_type, snapshot.name_to_type.get(name_or_type, None)
+                if type is None:
+                    raise KeyError(f"No contract registered with name '{name}'")
+            else:
+                name, type = snapshot.type_to_name.get(name_or_type, None), name_or_type
+                if name is None:
+                    raise KeyError(f"Contract {type} is not registered")
+
+            name_to_type = dict(snapshot.name_to_type)
+            type_to_name = dict(snapshot.type_to_name)
+            del name_to_type[name]
+            del type_to_name[type]
+            self._publish(name_to_type, type_to_name)
+
+    def translate(self, name_or_type: Union[str, type]) -> Union[type, str, None]:
+        """
+        Translates a name into a type or vice-versa.
+
+        :param name_or_type:
+                    The name or type to translate.
+        :return:
+                    The name of the type or the type for the name.
+                    Returns None if no mapping is present.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            mapping = snapshot.name_to_type if isinstance(name_or_type, str) else snapshot.type_to_name
+            translation = mapping.get(name_or_type, None)
+            if translation is not None:
+                return translation
+
+        translation = None if self._authoritative else self._discover(name_or_type)
+        if translation is None and snapshot is None:
+            raise NotInitialisedException()
+        return translation
+
+    def _discover(self, name_or_type: Union[str, type]) -> Union[type, str, None]:
+        """
+        Attempts to find and register a contract class via its entry-point.
+
+        :param name_or_type:
+                    The name or type to translate.
+        :return:
+                    The name of the type or the type for the name.
+                    Returns None if no entry-point exists for it.
+        """
+        entry_points_by_name = self._get_entry_points()
+
+        if isinstance(name_or_type, str):
+            entry_point = entry_points_by_name.get(name_or_type, None)
+        else:
+            value = f"{name_or_type.__module__}:{name_or_type.__qualname__}"
+            entry_point = next(
+                (
+                    entry_point
+                    for entry_point in entry_points_by_name.values()
+                    if entry_point.value == value
+                ),
+                None
+            )
+
+        if entry_point is None:
+            return None
+
+        type = entry_point.load()
+
+        with self._write_lock:
+            # The server may have initialised the registry in the meantime
+            if self._authoritative:
+                return None
+
+            snapshot = self._snapshot
+            if snapshot is not None:
+                # Another thread may have registered it in the meantime
+                if snapshot.name_to_type.get(entry_point.name, None) is type:
+                    return type if isinstance(name_or_type, str) else entry_point.name
+
+                # The server may have registered the name or the type differently
+                if entry_point.name in snapshot.name_to_type or type in snapshot.type_to_name:
+                    return None
+
+            # Discovery only adds translations, so existing cached state remains valid
+            name_to_type = {} if snapshot is None else dict(snapshot.name_to_type)
+            type_to_name = {} if snapshot is None else dict(snapshot.type_to_name)
+            self._add(name_to_type, type_to_name, entry_point.name, type)
+            self._publish(name_to_type, type_to_name, invalidate=snapshot is None)
+
+        return type if isinstance(name_or_type, str) else entry_point.name
+
+    def _get_entry_points(self) -> Dict[str, EntryPoint]:
+        """
+        Gets the entry-points in the discovery group, by name.
+        """
+        if self._entry_point_group is None:
+            return {}
+
+        discovered = self._entry_points
+        if discovered is None:
+            all_entry_points = entry_points()
+            group = (
+                all_entry_points.select(group=self._entry_point_group) if hasattr(all_entry_points, "select")
+                else all_entry_points.get(self._entry_point_group, tuple())
+            )
+            discovered = self._entry_points = {
+                entry_point.name: entry_point
+                for entry_point in group
+            }
+
+        return discovered
+
+    @staticmethod
+    def _add(name_to_type: Dict[str, type], type_to_name: Dict[type, str], name: str, type: type):
+        """
+        Validates a name/type pair and adds it to the mappings.
+        """
+        from ..base import UFDLJobContract
+
+        if not isinstance(name, str) or not name.isidentifier():
+            raise ValueError(f"Type-name '{name}' is not a valid Python identifier")
+        if not isinstance(type, builtins.type) or not issubclass(type, UFDLJobContract):
+            raise ValueError(f"Type must be a sub-class of {UFDLJobContract.__name__}")
+        if name in name_to_type:
+            raise ValueError(f"Type-name '{name}' is already registered")
+        if type in type_to_name:
+            raise ValueError(f"Multiple type-names detected for type {type}; mapping is not one-to-one")
+        name_to_type[name] = type
+        type_to_name[type] = name
+
+    def _publish(self, name_to_type: Dict[str, type], type_to_name: Dict[type, str], invalidate: bool = True):
+        """
+        Publishes a new version of the registry. Must be called with the write-lock held.
+
+        :param name_to_type:
+                    The new mapping from contract name to contract class.
+        :param type_to_name:
+                    The new mapping from contract class to contract name.
+        :param invalidate:
+                    Whether the change can invalidate state derived from the registry. If
+                    not, the version is kept and the hooks are not called.
+        """
+        if invalidate:
+            version = self._next_version
+            self._next_version += 1
+        else:
+            version = self._snapshot.version
+
+        self._snapshot = RegistrySnapshot(
+            version,
+            MappingProxyType(name_to_type),
+            MappingProxyType(type_to_name)
+        )
+
+        if invalidate:
+            for hook in self._hooks:
+                hook()
@@ -1 +1,10 @@
-from ._initialisation import initialise_server, name_type_translate
+from ._ContractRegistry import ContractRegistry, RegistrySnapshot
+from ._initialisation import (
+    ENTRY_POINT_GROUP,
+    REGISTRY,
+    add_initialisation_hook,
+    initialise_server,
+    name_type_translate,
+    register_contract,
+    unregister_contract
+)
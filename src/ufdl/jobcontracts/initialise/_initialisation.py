@@ -1,11 +1,24 @@
-import builtins
-from typing import Dict, Optional, Union
+from typing import Callable, Dict, Union
 
-from ufdl.jobtypes.error import NotInitialisedException
+from ._ContractRegistry import ContractRegistry
 
-# Name/type mappings
-NAME_TO_TYPE_MAP: Optional[Dict[str, type]] = None
-TYPE_TO_NAME_MAP: Optional[Dict[type, str]] = None
+# The entry-point group under which contract classes can be discovered
+ENTRY_POINT_GROUP = "ufdl.jobcontracts"
+
+# The registry of contract classes known to the server
+REGISTRY = ContractRegistry(ENTRY_POINT_GROUP)
+
+
+def add_initialisation_hook(hook: Callable[[], None]):
+    """
+    Adds a function to be called whenever the server is (re-)initialised or the
+    registry of contract classes otherwise changes, e.g. to invalidate state which
+    depends on the name/type mapping.
+
+    :param hook:
+                The function to call.
+    """
+    REGISTRY.add_hook(hook)
 
 
 def initialise_server(
@@ -14,21 +27,30 @@ def initialise_server(
     """
     Initialises the type-systems connection to the server.
     """
-    global NAME_TO_TYPE_MAP, TYPE_TO_NAME_MAP
-    from ..base import UFDLJobContract
+    REGISTRY.replace(name_to_type_map)
+
+
+def register_contract(name: str, type: type):
+    """
+    Registers a single contract class with the server, without
+    re-initialising the entire registry.
+
+    :param name:
+                The name of the contract class.
+    :param type:
+                The contract class.
+    """
+    REGISTRY.register(name, type)
+
+
+def unregister_contract(name_or_type: Union[str, type]):
+    """
+    Removes a single contract class from the server's registry.
 
-    # Verify and reverse the name/type mapping
-    NAME_TO_TYPE_MAP = {}
-    TYPE_TO_NAME_MAP = {}
-    for name, type in name_to_type_map.items():
-        if not name.isidentifier():
-            raise ValueError(f"Type-name '{name}' is not a valid Python identifier")
-        if not isinstance(type, builtins.type) or not issubclass(type, UFDLJobContract):
-            raise ValueError(f"Type must be a sub-class of {UFDLJobContract.__name__}")
-        if type in TYPE_TO_NAME_MAP:
-            raise ValueError(f"Multiple type-names detected for type {type}; mapping is not one-to-one")
-        NAME_TO_TYPE_MAP[name] = type
-        TYPE_TO_NAME_MAP[type] = name
+    :param name_or_type:
+                The name of the contract class, or the class itself.
+    """
+    REGISTRY.unregister(name_or_type)
 
 
 def name_type_translate(name_or_type: Union[str, type]) -> Union[type, str, None]:
@@ -41,8 +63,4 @@ def name_type_translate(name_or_type: Union[str, type]) -> Union[type, str, None
                 The name of the type or the type for the name.
                 Returns None if no mapping is present.
     """
-    global NAME_TO_TYPE_MAP, TYPE_TO_NAME_MAP
-    mapping = NAME_TO_TYPE_MAP if isinstance(name_or_type, str) else TYPE_TO_NAME_MAP
-    if mapping is None:
-        raise NotInitialisedException()
-    return mapping.get(name_or_type, None)
+    return REGISTRY.translate(name_or_type)
@@ -0,0 +1,81 @@
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple
+
+
+class OperationMetrics(NamedTuple):
+    """
+    The metrics recorded for a single instrumented operation.
+    """
+    count: int
+    total_time: float
+    max_depth: int
+
+
+class MetricsCollector:
+    """
+    Instrumentation callback which accumulates the call count, cumulative time
+    and maximum recursion depth of each instrumented operation.
+    """
+    def __init__(self):
+        self._metrics: Dict[str, OperationMetrics] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, operation: str, duration: float, depth: int):
+        with self._lock:
+            current = self._metrics.get(operation, None)
+            if current is None:
+                current = OperationMetrics(0, 0.0, 0)
+            self._metrics[operation] = OperationMetrics(
+                current.count + 1,
+                # Only count the outermost call's time, so recursion isn't double-counted
+                current.total_time + duration if depth == 1 else current.total_time,
+                max(current.max_depth, depth)
+            )
+
+    @property
+    def metrics(self) -> Dict[str, OperationMetrics]:
+        """
+        The metrics recorded so far, by operation name.
+        """
+        with self._lock:
+            return dict(self._metrics)
+
+    def reset(self):
+        """
+        Discards all recorded metrics.
+        """
+        with self._lock:
+            self._metrics.clear()
+
+    @staticmethod
+    def cache_hit_rates() -> Dict[str, Optional[float]]:
+        """
+        Gets the hit rate of each of the package's caches, or None for caches
+        which haven't been used.
+        """
+        from ..cache import contract_cache_info, subtype_cache_info
+
+        def hit_rate(info: Tuple[int, int, Optional[int], int]) -> Optional[float]:
+            hits, misses = info[0], info[1]
+            total = hits + misses
+            return None if total == 0 else hits / total
+
+        rates = {
+            f"contract_{name}": hit_rate(info)
+            for name, info in contract_cache_info().items()
+        }
+        rates["subtype"] = hit_rate(subtype_cache_info())
+        return rates
+
+    def report(self) -> str:
+        """
+        Formats the recorded metrics and cache hit rates as a table.
+        """
+        lines = [f"{'operation':<45} {'count':>10} {'total (s)':>12} {'max depth':>10}"]
+        for operation, metrics in sorted(self.metrics.items()):
+            lines.append(
+                f"{operation:<45} {metrics.count:>10} {metrics.total_time:>12.6f} {metrics.max_depth:>10}"
+            )
+        for cache, rate in self.cache_hit_rates().items():
+            lines.append(f"{cache + ' cache hit rate':<45} {'-' if rate is None else f'{rate:.1%}':>10}")
+        return "\n".join(lines)
@@ -0,0 +1,7 @@
+from ._instrumented import (
+    InstrumentationCallback,
+    instrument,
+    instrumented,
+    set_instrumentation
+)
+from ._MetricsCollector import MetricsCollector, OperationMetrics
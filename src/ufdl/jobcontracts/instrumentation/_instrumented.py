@@ -0,0 +1,80 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, TypeVar
+
+# Signature of instrumentation callbacks: (operation, duration in seconds, recursion depth)
+InstrumentationCallback = Callable[[str, float, int], None]
+
+FunctionType = TypeVar('FunctionType', bound=Callable)
+
+# The current instrumentation callback, or None if instrumentation is disabled
+INSTRUMENTATION: Optional[InstrumentationCallback] = None
+
+# Per-thread recursion depth of each instrumented operation
+_DEPTHS = threading.local()
+
+
+def set_instrumentation(callback: Optional[InstrumentationCallback]):
+    """
+    Sets the callback which is informed of each instrumented operation, or
+    disables instrumentation if None.
+
+    :param callback:
+                Function taking the name of the operation, its duration in seconds,
+                and its recursion depth (1 for the outermost call).
+    """
+    global INSTRUMENTATION
+    INSTRUMENTATION = callback
+
+
+@contextmanager
+def instrument(callback: InstrumentationCallback) -> Iterator[InstrumentationCallback]:
+    """
+    Context manager which enables instrumentation for the duration of its block,
+    restoring the previous callback afterwards.
+
+    :param callback:
+                The instrumentation callback.
+    :return:
+                The callback.
+    """
+    previous = INSTRUMENTATION
+    set_instrumentation(callback)
+    try:
+        yield callback
+    finally:
+        set_instrumentation(previous)
+
+
+def instrumented(operation: str) -> Callable[[FunctionType], FunctionType]:
+    """
+    Decorator which reports each call to the decorated function to the current
+    instrumentation callback. When instrumentation is disabled, the only
+    overhead is a single global lookup.
+
+    :param operation:
+                The name to report the operation under.
+    """
+    def decorator(function: FunctionType) -> FunctionType:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            callback = INSTRUMENTATION
+            if callback is None:
+                return function(*args, **kwargs)
+
+            depths: Dict[str, int] = _DEPTHS.__dict__.setdefault("depths", {})
+            depth = depths.get(operation, 0) + 1
+            depths[operation] = depth
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                depths[operation] = depth - 1
+                callback(operation, duration, depth)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,20 @@
+from typing import Dict, FrozenSet, Hashable, Optional, Tuple
+
+from ufdl.jobtypes.base import UFDLType
+
+
+class FixedBounds(Dict[str, Tuple[UFDLType, Optional[UFDLType]]]):
+    """
+    The (lower, upper) bounds of each parameter of a set of parameters, along
+    with the identity of the fixes which produced them, or None if the fixes
+    are not known (e.g. the bounds were derived from a plain dictionary).
+    """
+    __slots__ = ("fixes",)
+
+    def __init__(
+            self,
+            bounds: Dict[str, Tuple[UFDLType, Optional[UFDLType]]],
+            fixes: Optional[FrozenSet[Tuple[str, Hashable]]]
+    ):
+        super().__init__(bounds)
+        self.fixes: Optional[FrozenSet[Tuple[str, Hashable]]] = fixes
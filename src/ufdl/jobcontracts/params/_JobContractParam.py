@@ -2,13 +2,16 @@ from typing import Iterator, List, Union
 
 from ufdl.jobtypes.base import UFDLType
 
+from .._immutable import Immutable
 from ._TypeConstructor import TypeConstructor
 
 
-class JobContractParam:
+class JobContractParam(Immutable):
     """
     TODO
     """
+    __slots__ = ("_name", "_bound", "_bound_base", "_dependents")
+
     def __init__(
             self,
             name: str,
@@ -1,8 +1,12 @@
 from collections import OrderedDict
-from typing import Dict, Iterable, Iterator, Optional, Tuple, Type, Union
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Hashable, Iterable, Iterator, List, Mapping, Optional, Tuple, Type, Union
 
 from ufdl.jobtypes.base import UFDLType
 
+from ..cache import LRUCache, is_subtype, type_key
+from ..instrumentation import instrumented
+from ._FixedBounds import FixedBounds
 from ._JobContractParam import JobContractParam
 from ._TypeConstructor import TypeConstructor
 
@@ -11,8 +15,16 @@ class JobContractParams(Iterable[JobContractParam]):
     """
     TODO
     """
+    # The maximum number of sets of fixes for which the resulting bounds are cached
+    BOUNDS_CACHE_SIZE: Optional[int] = 256
+
     def __init__(self):
         self._params: OrderedDict[str, JobContractParam] = OrderedDict()
+        self._plan: Optional[_PropagationPlan] = None
+        self._str: Optional[str] = None
+        self._bounds_cache: LRUCache[FrozenSet[Tuple[str, Hashable]], FixedBounds] = LRUCache(self.BOUNDS_CACHE_SIZE)
+        self._owner: Optional[type] = None
+        self._enumeration_cache: LRUCache[Hashable, Tuple[Mapping[str, UFDLType], ...]] = LRUCache(self.BOUNDS_CACHE_SIZE)
 
     def __getitem__(self, name: str):
         return self._params[name]
@@ -20,6 +32,23 @@ class JobContractParams(Iterable[JobContractParam]):
     def __contains__(self, name: str) -> bool:
         return name in self._params
 
+    def _set_owner(self, owner: type):
+        """
+        Records the contract class which these parameters belong to, so that
+        they can be pickled as a reference to that class.
+
+        :param owner:
+                    The contract class.
+        """
+        if self._owner is None:
+            self._owner = owner
+
+    def __reduce__(self):
+        if self._owner is None:
+            raise TypeError("Only parameters belonging to a contract class can be pickled")
+
+        return _owned_params, (self._owner,)
+
     def names(self) -> Iterator[str]:
         return iter(self._params.keys())
 
@@ -61,14 +90,19 @@ class JobContractParams(Iterable[JobContractParam]):
             self[dependency].add_dependent(name)
 
         self._params[name] = param
+        self._plan = None
+        self._str = None
+        self._bounds_cache.clear()
+        self._enumeration_cache.clear()
 
         return name
 
-    def get_new_bounds_for_fixed(self, **fixes: UFDLType) -> Dict[str, Tuple[UFDLType, Optional[UFDLType]]]:
+    @instrumented("JobContractParams.get_new_bounds_for_fixed")
+    def get_new_bounds_for_fixed(self, **fixes: UFDLType) -> FixedBounds:
         """
         Given a number of 'fixes' (a fixed type for a type-parameter, returns a dictionary from
         each type parameter to the (lower, upper) boundary types that the type parameter can take
-        without violating the 'fixes'.
+        without violating the 'fixes'. Results are cached per distinct set of fixes.
 
         :param fixes:
                     The parameters to fix the types of.
@@ -76,68 +110,270 @@ class JobContractParams(Iterable[JobContractParam]):
                     The (lower, upper) boundary types for all parameters.
         """
         # Use the current bounds as a starting point
-        fixed_bounds = {
-            param_name: (param.bound_base, None)
-            for param_name, param in self._params.items()
-        }
+        initial_bounds = FixedBounds(
+            {
+                param_name: (param.bound_base, None)
+                for param_name, param in self._params.items()
+            },
+            frozenset()
+        )
 
-        # Process each fix in turn
-        for param_name, fix in fixes.items():
-            if param_name not in fixed_bounds:
+        return self.get_new_bounds_for_additional_fixed(initial_bounds, **fixes)
+
+    def get_new_bounds_for_additional_fixed(
+            self,
+            previous_bounds: Dict[str, Tuple[UFDLType, Optional[UFDLType]]],
+            **fixes: UFDLType
+    ) -> FixedBounds:
+        """
+        Applies further fixes to the bounds resulting from previous fixes, without
+        recomputing the effects of the previous fixes.
+
+        :param previous_bounds:
+                    The bounds resulting from the previous fixes, as returned by
+                    get_new_bounds_for_fixed or this method.
+        :param fixes:
+                    The additional parameters to fix the types of.
+        :return:
+                    The (lower, upper) boundary types for all parameters.
+        """
+        for param_name in fixes:
+            if param_name not in self._params:
                 raise ValueError(f"Can't fix unknown parameter '{param_name}'")
 
-            # Fix the specified parameter to the given fix-type
+        # Identify the combined fixes, if the previous fixes are known
+        key: Optional[FrozenSet[Tuple[str, Hashable]]] = None
+        if isinstance(previous_bounds, FixedBounds) and previous_bounds.fixes is not None:
+            key = previous_bounds.fixes.union(
+                (param_name, type_key(fix))
+                for param_name, fix in fixes.items()
+            )
+            cached = self._bounds_cache.get(key)
+            if cached is not None:
+                return FixedBounds(cached, key)
+
+        fixed_bounds = dict(previous_bounds)
+
+        # Fix each specified parameter to the given fix-type
+        for param_name, fix in fixes.items():
             self._update_fixed_bounds(fixed_bounds, param_name, fix, fix)
 
-            # Get the parameter being fixed
-            fixed_param = self[param_name]
+        # Propagate the fixes through the dependency graph
+        self._propagate(fixed_bounds, fixes.keys())
 
-            # Update the bounds on each dependent parameter
-            self._update_dependents(fixed_bounds, fixed_param)
+        # Without known previous fixes, neither is the provenance of the result
+        if key is None:
+            return FixedBounds(fixed_bounds, None)
 
-            # Update the bounds on each parameter we depend on
-            self._update_dependencies(fixed_bounds, fixed_param)
+        result = FixedBounds(fixed_bounds, key)
+        self._bounds_cache.put(key, result)
+        return FixedBounds(result, key)
 
-        return fixed_bounds
+    def set_bounds_cache_size(self, max_size: Optional[int]):
+        """
+        Sets the maximum number of sets of fixes for which the resulting bounds are cached.
 
-    def _update_dependents(
+        :param max_size:
+                    The maximum number of cached results, 0 to disable
+                    caching, or None for no limit.
+        """
+        self._bounds_cache.max_size = max_size
+
+    def clear_bounds_cache(self):
+        """
+        Removes all cached bounds.
+        """
+        self._bounds_cache.clear()
+
+    def bounds_cache_info(self) -> Tuple[int, int, Optional[int], int]:
+        """
+        Gets the statistics of the cache of bounds for sets of fixes.
+
+        :return:
+                    The hits, misses, maximum size and current size of the cache.
+        """
+        return self._bounds_cache.info()
+
+    def infer_types(
             self,
-            fixed_bounds: Dict[str, Tuple[UFDLType, Optional[UFDLType]]],
-            param: JobContractParam
-    ):
-        for dependent_param_name in param.dependents:
-            dependent_param = self[dependent_param_name]
-            dependent_param_bound = dependent_param.bound
-            assert isinstance(dependent_param_bound, TypeConstructor)
-            self._update_fixed_bounds(
-                fixed_bounds,
-                dependent_param_name,
-                dependent_param_bound.construct({
-                    name: bounds[0]
-                    for name, bounds in fixed_bounds.items()
-                }),
-                None
-            )
-            self._update_dependents(fixed_bounds, dependent_param)
+            *observations: Tuple[Union[UFDLType, TypeConstructor], UFDLType]
+    ) -> Dict[str, UFDLType]:
+        """
+        Infers the most specific type for each parameter from concrete types which
+        were constructed from the parameters.
+
+        :param observations:
+                    Pairs of (constructor, concrete type) where the concrete type is one
+                    that the constructor constructed.
+        :return:
+                    The inferred type of every parameter.
+        """
+        # Extract the candidate types for each parameter from the concrete types
+        candidates: Dict[str, List[UFDLType]] = {}
+        for constructor, concrete_type in observations:
+            if isinstance(constructor, TypeConstructor):
+                for param_name, extracted in constructor.extract_dependency_types(concrete_type).items():
+                    candidates.setdefault(param_name, []).extend(extracted)
+            elif not is_subtype(concrete_type, constructor):
+                raise ValueError(f"Type {concrete_type} is not a sub-type of {constructor}")
+
+        # The candidates for a parameter must agree, so fix it to the most specific
+        fixes: Dict[str, UFDLType] = {}
+        for param_name, param_candidates in candidates.items():
+            if param_name not in self._params:
+                raise ValueError(f"Can't infer unknown parameter '{param_name}'")
+            most_specific = param_candidates[0]
+            for candidate in param_candidates[1:]:
+                if is_subtype(candidate, most_specific):
+                    most_specific = candidate
+                elif not is_subtype(most_specific, candidate):
+                    raise ValueError(
+                        f"Conflicting types inferred for parameter '{param_name}': {most_specific} and {candidate}"
+                    )
+            fixes[param_name] = most_specific
+
+        # Parameters not fixed by the observations take their most specific bound
+        return {
+            param_name: lower if upper is None else upper
+            for param_name, (lower, upper) in self.get_new_bounds_for_fixed(**fixes).items()
+        }
+
+    def enumerate_types(self, catalogue: Mapping[str, Iterable[UFDLType]]) -> List[Dict[str, UFDLType]]:
+        """
+        Enumerates every valid assignment of types to the parameters, drawing the types
+        of parameters from a catalogue of candidates. Parameters are fixed one at a time,
+        and candidates which violate the bounds resulting from the previous fixes are
+        pruned along with all their combinations with later candidates. Results are
+        cached by the content of the catalogue.
+
+        :param catalogue:
+                    The candidate types for (some of) the parameters, by parameter name.
+                    Parameters not in the catalogue take their most specific bound.
+        :return:
+                    The valid assignments of types to all parameters.
+        """
+        candidates: List[Tuple[str, Tuple[UFDLType, ...]]] = []
+        for param_name in self._params:
+            if param_name in catalogue:
+                candidates.append((param_name, tuple(catalogue[param_name])))
+        for param_name in catalogue:
+            if param_name not in self._params:
+                raise ValueError(f"Catalogue contains unknown parameter '{param_name}'")
+
+        key = tuple(
+            (param_name, tuple(type_key(candidate) for candidate in param_candidates))
+            for param_name, param_candidates in candidates
+        )
+
+        results = self._enumeration_cache.get(key)
+        if results is None:
+            results = tuple(self._enumerate(candidates, 0, self.get_new_bounds_for_fixed()))
+            self._enumeration_cache.put(key, results)
+
+        return [dict(result) for result in results]
+
+    def _enumerate(
+            self,
+            candidates: List[Tuple[str, Tuple[UFDLType, ...]]],
+            index: int,
+            bounds: FixedBounds
+    ) -> Iterator[Mapping[str, UFDLType]]:
+        """
+        Enumerates the valid assignments which extend the given bounds with
+        candidates for the parameters from the given index onwards.
+        """
+        if index == len(candidates):
+            yield MappingProxyType({
+                param_name: lower if upper is None else upper
+                for param_name, (lower, upper) in bounds.items()
+            })
+            return
+
+        param_name, param_candidates = candidates[index]
+        lower, _ = bounds[param_name]
+        for candidate in param_candidates:
+            # Cheaply reject candidates outside the current bounds before propagating
+            if not is_subtype(candidate, lower):
+                continue
+            try:
+                next_bounds = self.get_new_bounds_for_additional_fixed(bounds, **{param_name: candidate})
+            except ValueError:
+                continue
+            yield from self._enumerate(candidates, index + 1, next_bounds)
+
+    def _compile(self) -> '_PropagationPlan':
+        """
+        Compiles the dependency graph of the parameters into a plan for bound propagation.
+        """
+        plan = self._plan
+        if plan is None:
+            plan = self._plan = _PropagationPlan(self._params)
+        return plan
 
-    def _update_dependencies(
+    def _propagate(
             self,
             fixed_bounds: Dict[str, Tuple[UFDLType, Optional[UFDLType]]],
-            param: JobContractParam
+            fixed: Iterable[str]
     ):
-        param_bound = param.bound
-        for dependency_param_name in param.dependencies:
-            dependency_param = self[dependency_param_name]
-            fix_types = param_bound.extract_dependency_type(dependency_param_name, fixed_bounds[str(param.name)][0])
-            for fix_type in fix_types:
+        """
+        Propagates the bounds of the given fixed parameters to all parameters
+        which depend on them (raising their lower bounds) and to all parameters
+        they depend on (lowering their upper bounds), visiting each affected
+        parameter exactly once.
+
+        :param fixed_bounds:
+                    The current bounds, updated in-place.
+        :param fixed:
+                    The names of the parameters which have been fixed.
+        """
+        plan = self._compile()
+        order = plan.order
+
+        # Collect the affected parameters, by topological position
+        dependent_positions = set()
+        dependency_positions = set()
+        for param_name in fixed:
+            dependent_positions.update(plan.dependent_closures[param_name])
+            dependency_positions.update(plan.dependency_closures[param_name])
+            dependency_positions.add(plan.positions[param_name])
+
+        # Update the lower bounds of dependents, dependencies-first
+        if len(dependent_positions) > 0:
+            lower_bounds = {
+                name: bounds[0]
+                for name, bounds in fixed_bounds.items()
+            }
+            for position in sorted(dependent_positions):
+                dependent_param = order[position]
+                dependent_param_name = dependent_param.name
                 self._update_fixed_bounds(
                     fixed_bounds,
-                    str(dependency_param_name),
-                    None,
-                    fix_type
+                    dependent_param_name,
+                    dependent_param.bound.construct(lower_bounds),
+                    None
                 )
-
-            self._update_dependencies(fixed_bounds, dependency_param)
+                lower_bounds[dependent_param_name] = fixed_bounds[dependent_param_name][0]
+
+        # Update the upper bounds of dependencies, dependents-first
+        for position in sorted(dependency_positions, reverse=True):
+            param = order[position]
+            param_bound = param.bound
+            if not isinstance(param_bound, TypeConstructor):
+                continue
+
+            # Extract from the most specific type known for the parameter
+            lower_bound, upper_bound = fixed_bounds[param.name]
+            from_type = upper_bound if upper_bound is not None else lower_bound
+
+            extracted = param_bound.extract_dependency_types(from_type)
+            for dependency_param_name in plan.dependencies[param.name]:
+                for fix_type in extracted[dependency_param_name]:
+                    self._update_fixed_bounds(
+                        fixed_bounds,
+                        dependency_param_name,
+                        None,
+                        fix_type
+                    )
 
     @staticmethod
     def _update_fixed_bounds(
@@ -148,19 +384,19 @@ class JobContractParams(Iterable[JobContractParam]):
     ):
         current_lower_bound, current_upper_bound = fixed_bounds[param_name]
 
-        if new_lower_bound is None or current_lower_bound.is_subtype_of(new_lower_bound):
+        if new_lower_bound is None or is_subtype(current_lower_bound, new_lower_bound):
             new_lower_bound = current_lower_bound
-        elif not new_lower_bound.is_subtype_of(current_lower_bound):
+        elif not is_subtype(new_lower_bound, current_lower_bound):
             raise ValueError(f"Incompatible lower bounds {new_lower_bound} and {current_lower_bound}")
 
         if current_upper_bound is None:
             pass
-        elif new_upper_bound is None or new_upper_bound.is_subtype_of(current_upper_bound):
+        elif new_upper_bound is None or is_subtype(new_upper_bound, current_upper_bound):
             new_upper_bound = current_upper_bound
-        elif not current_upper_bound.is_subtype_of(new_upper_bound):
+        elif not is_subtype(current_upper_bound, new_upper_bound):
             raise ValueError(f"Incompatible upper bounds {new_upper_bound} and {current_upper_bound}")
 
-        if new_upper_bound is not None and not new_upper_bound.is_subtype_of(new_lower_bound):
+        if new_upper_bound is not None and not is_subtype(new_upper_bound, new_lower_bound):
             raise ValueError(f"Bounds crossed: {new_upper_bound} is not a sub-type of {new_lower_bound}")
 
         fixed_bounds[param_name] = (new_lower_bound, new_upper_bound)
@@ -172,7 +408,53 @@ class JobContractParams(Iterable[JobContractParam]):
         return iter(self._params.values())
 
     def __str__(self):
-        if len(self) == 0:
-            return ""
+        formatted = self._str
+        if formatted is None:
+            formatted = self._str = (
+                "" if len(self) == 0
+                else f"<{', '.join(str(param) for param in self)}>"
+            )
+        return formatted
+
+
+def _owned_params(owner: type) -> JobContractParams:
+    """
+    Gets the parameters of a contract class, when unpickling them.
+    """
+    return owner.params()
+
+
+class _PropagationPlan:
+    """
+    The dependency graph of a set of parameters, compiled for bound propagation.
+    As parameters can only depend on parameters added before them, the order of
+    addition is a topological order of the graph.
+    """
+    def __init__(self, params: 'OrderedDict[str, JobContractParam]'):
+        self.order: List[JobContractParam] = list(params.values())
+        self.positions: Dict[str, int] = {
+            param_name: position
+            for position, param_name in enumerate(params.keys())
+        }
+        self.dependencies: Dict[str, Tuple[str, ...]] = {
+            param_name: tuple(sorted(set(param.dependencies), key=self.positions.__getitem__))
+            for param_name, param in params.items()
+        }
 
-        return f"<{', '.join(str(param) for param in self)}>"
+        # Dependency closures are built dependencies-first
+        self.dependency_closures: Dict[str, FrozenSet[int]] = {}
+        for param_name in params.keys():
+            closure = set()
+            for dependency_param_name in self.dependencies[param_name]:
+                closure.add(self.positions[dependency_param_name])
+                closure.update(self.dependency_closures[dependency_param_name])
+            self.dependency_closures[param_name] = frozenset(closure)
+
+        # Dependent closures are built dependents-first
+        self.dependent_closures: Dict[str, FrozenSet[int]] = {}
+        for param_name in reversed(params.keys()):
+            closure = set()
+            for dependent_param_name in params[param_name].dependents:
+                closure.add(self.positions[dependent_param_name])
+                closure.update(self.dependent_closures[dependent_param_name])
+            self.dependent_closures[param_name] = frozenset(closure)
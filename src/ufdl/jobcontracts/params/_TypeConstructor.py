@@ -1,13 +1,24 @@
-from typing import Dict, Iterator, List, Optional, Type, Union
+from types import MappingProxyType
+from typing import Callable, Dict, Hashable, Iterator, List, Mapping, Optional, Tuple, Type, Union
 
 from ufdl.jobtypes.base import UFDLType
 
+from ..cache import LRUCache, is_subtype, type_key
+from ..instrumentation import instrumented
+
 
 class TypeConstructor:
     """
     Class which has the ability to construct a specific type once its generic
     parameters are satisfied.
     """
+    # The maximum number of constructed/deconstructed types cached by each constructor
+    CONSTRUCTION_CACHE_SIZE: Optional[int] = 128
+
+    # Recently-constructed types, shared between all constructors so that
+    # structurally-equal (sub-)types are only held in memory once
+    _interned_types: LRUCache[Hashable, UFDLType] = LRUCache(1024)
+
     @classmethod
     def direct_dependency(cls, bound: str) -> 'TypeConstructor':
         return cls(bound)
@@ -60,6 +71,18 @@ class TypeConstructor:
                 elif isinstance(arg, TypeConstructor):
                     self._dependencies.update(arg.dependencies)
 
+        # The dependencies in a fixed order, for keying the construction cache
+        self._dependency_order: Tuple[str, ...] = tuple(sorted(self._dependencies))
+
+        self._evaluate: Callable[[Mapping[str, UFDLType]], UFDLType] = self._compile()
+        self._construction_cache: LRUCache[Tuple[Hashable, ...], UFDLType] = LRUCache(self.CONSTRUCTION_CACHE_SIZE)
+
+        # Where each dependency occurs in the constructed type
+        self._dependency_paths = self._get_dependency_paths()
+        self._extraction_cache: LRUCache[Hashable, Mapping[str, Tuple[UFDLType, ...]]] = (
+            LRUCache(self.CONSTRUCTION_CACHE_SIZE)
+        )
+
     @property
     def bound_base(self):
         return self._bound_base
@@ -68,18 +91,64 @@ class TypeConstructor:
     def dependencies(self) -> Iterator[str]:
         yield from self._dependencies
 
-    def construct(self, types: Dict[str, UFDLType]) -> UFDLType:
+    @instrumented("TypeConstructor.construct")
+    def construct(self, types: Mapping[str, UFDLType]) -> UFDLType:
         if isinstance(self._bound, str):
             return types[self._bound]
 
-        return self._bound(
-            tuple(
-                types[arg] if isinstance(arg, str)
-                else arg.construct(types) if isinstance(arg, TypeConstructor)
-                else arg
-                for arg in self._args
+        key = tuple(type_key(types[dependency]) for dependency in self._dependency_order)
+        return self._construction_cache.get_or_create(key, lambda: self._evaluate(types))
+
+    def _compile(self) -> Callable[[Mapping[str, UFDLType]], UFDLType]:
+        """
+        Compiles this constructor into a function which constructs its type from the
+        types of its dependencies, without re-inspecting the arguments on each call.
+        """
+        bound = self._bound
+
+        # Direct dependencies just look up the type
+        if isinstance(bound, str):
+            return lambda types: types[bound]
+
+        # Constant arguments are placed once, and only dependent arguments are evaluated
+        template: List[Optional[UFDLType]] = []
+        dependent_args: List[Tuple[int, Callable[[Mapping[str, UFDLType]], UFDLType]]] = []
+        for index, arg in enumerate(self._args):
+            if isinstance(arg, str):
+                template.append(None)
+                dependent_args.append((index, lambda types, name=arg: types[name]))
+            elif isinstance(arg, TypeConstructor):
+                template.append(None)
+                dependent_args.append((index, arg._evaluate))
+            else:
+                template.append(arg)
+
+        if len(dependent_args) == 0:
+            constant_type = bound(tuple(template))
+            return lambda types: constant_type
+
+        interned_types = self._interned_types
+
+        def evaluate(types: Mapping[str, UFDLType]) -> UFDLType:
+            args = template.copy()
+            for index, evaluate_arg in dependent_args:
+                args[index] = evaluate_arg(types)
+            args = tuple(args)
+            return interned_types.get_or_create(
+                (bound, tuple(type_key(arg) for arg in args)),
+                lambda: bound(args)
             )
-        )
+
+        return evaluate
+
+    def construction_cache_info(self) -> Tuple[int, int, Optional[int], int]:
+        """
+        Gets the statistics of the cache of types constructed by this constructor.
+
+        :return:
+                    The hits, misses, maximum size and current size of the cache.
+        """
+        return self._construction_cache.info()
 
     def bound_str(self) -> str:
         if isinstance(self._bound, str):
@@ -102,19 +171,62 @@ class TypeConstructor:
         if dependency_name not in self._dependencies:
             raise ValueError(f"{dependency_name} is not a dependency of {self.bound_str()}")
 
+        return list(self.extract_dependency_types(from_type)[dependency_name])
+
+    def extract_dependency_types(self, from_type: UFDLType) -> Mapping[str, Tuple[UFDLType, ...]]:
+        """
+        Extracts the types of all dependencies from a type constructed by this constructor,
+        in a single traversal of the type.
+
+        :param from_type:
+                    The constructed type.
+        :return:
+                    A map from each dependency name to the types at the positions in the
+                    type where that dependency occurs.
+        """
         # For a simple dependency, there is only one dependency name, and it matches the entire type
         if isinstance(self._bound, str):
-            return [from_type]
+            return MappingProxyType({self._bound: (from_type,)})
 
-        if not from_type.is_subtype_of(self._bound_base):
-            raise ValueError(f"Type {from_type} is not constructable by {self.bound_str()}")
+        return self._extraction_cache.get_or_create(
+            type_key(from_type),
+            lambda: self._extract_dependency_types(from_type)
+        )
 
-        results = []
-        for from_type_type_arg, sub_bound in zip(from_type.type_args, self._args):
-            if isinstance(sub_bound, str):
-                if sub_bound == dependency_name:
-                    results.append(from_type_type_arg)
-            elif isinstance(sub_bound, TypeConstructor):
-                results += sub_bound.extract_dependency_type(dependency_name, from_type_type_arg)
+    def _extract_dependency_types(self, from_type: UFDLType) -> Mapping[str, Tuple[UFDLType, ...]]:
+        if not is_subtype(from_type, self._bound_base):
+            raise ValueError(f"Type {from_type} is not constructable by {self.bound_str()}")
 
-        return results
+        results: Dict[str, List[UFDLType]] = {
+            dependency_name: []
+            for dependency_name in self._dependency_order
+        }
+        for path, dependency_name in self._dependency_paths:
+            extracted = from_type
+            for index in path:
+                extracted = extracted.type_args[index]
+            results[dependency_name].append(extracted)
+
+        return MappingProxyType({
+            dependency_name: tuple(extracted)
+            for dependency_name, extracted in results.items()
+        })
+
+    def _get_dependency_paths(self) -> Tuple[Tuple[Tuple[int, ...], str], ...]:
+        """
+        Gets the paths of type-argument indices at which each dependency
+        occurs in the constructed type, in depth-first order.
+        """
+        if isinstance(self._bound, str):
+            return (tuple(), self._bound),
+
+        paths = []
+        for index, arg in enumerate(self._args):
+            if isinstance(arg, str):
+                paths.append(((index,), arg))
+            elif isinstance(arg, TypeConstructor):
+                paths.extend(
+                    ((index,) + path, dependency_name)
+                    for path, dependency_name in arg._dependency_paths
+                )
+        return tuple(paths)
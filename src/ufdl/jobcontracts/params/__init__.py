@@ -1,2 +1,4 @@
+from ._FixedBounds import FixedBounds
+from ._JobContractParam import JobContractParam
 from ._JobContractParams import JobContractParams
 from ._TypeConstructor import TypeConstructor
@@ -0,0 +1,216 @@
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple, Type, Union
+
+from ufdl.jobtypes.base import UFDLType
+from ufdl.jobtypes.standard import JobOutput
+
+from ..base import UFDLJobContract
+from ..cache import is_subtype, type_key
+from ..error import PipelineTypeException
+from ._PipelineEdge import PipelineEdge
+
+# A node of a pipeline is either a contract, or a contract class whose type-arguments are inferred
+PipelineNode = Union[UFDLJobContract, Type[UFDLJobContract]]
+
+
+class ContractPipeline:
+    """
+    Directed acyclic graph of job contracts, where the outputs of some jobs
+    feed the inputs of others.
+
+    An output can feed an input which accepts a JobOutput<X> type where the type of
+    the output is a sub-type of X. Nodes can be given as contract classes, in which
+    case their type-arguments are inferred from the outputs which feed them.
+    """
+    def __init__(self):
+        self._nodes: OrderedDict[str, PipelineNode] = OrderedDict()
+        self._edges: List[PipelineEdge] = []
+        self._edges_by_target: Dict[str, List[PipelineEdge]] = {}
+        self._fed_inputs: Dict[Tuple[str, str], PipelineEdge] = {}
+
+    def add_node(self, name: str, node: PipelineNode) -> str:
+        """
+        Adds a job to the pipeline.
+
+        :param name:
+                    The name of the node.
+        :param node:
+                    The contract of the job, or the contract class if its
+                    type-arguments should be inferred.
+        :return:
+                    The name of the node.
+        """
+        if name in self._nodes:
+            raise ValueError(f"Node '{name}' already exists")
+        if not (
+                isinstance(node, UFDLJobContract)
+                or (isinstance(node, type) and issubclass(node, UFDLJobContract))
+        ):
+            raise ValueError(f"Node '{name}' is not a contract or contract class: {node}")
+
+        self._nodes[name] = node
+        self._edges_by_target[name] = []
+
+        return name
+
+    def add_edge(self, source: str, output_name: str, target: str, input_name: str) -> PipelineEdge:
+        """
+        Feeds an output of one node into an input of another.
+
+        :param source:
+                    The name of the node producing the output.
+        :param output_name:
+                    The name of the output.
+        :param target:
+                    The name of the node consuming the input.
+        :param input_name:
+                    The name of the input.
+        :return:
+                    The added edge.
+        """
+        edge = PipelineEdge(source, output_name, target, input_name)
+
+        for node_name in (source, target):
+            if node_name not in self._nodes:
+                raise ValueError(f"Unknown node '{node_name}' in edge {edge}")
+        if output_name not in self._contract_class(source).output_constructors():
+            raise ValueError(f"Node '{source}' has no output \"{output_name}\"")
+        if input_name not in self._contract_class(target).input_constructors():
+            raise ValueError(f"Node '{target}' has no input \"{input_name}\"")
+        if (target, input_name) in self._fed_inputs:
+            raise ValueError(
+                f"Input \"{input_name}\" of node '{target}' is already fed by {self._fed_inputs[(target, input_name)]}"
+            )
+
+        self._edges.append(edge)
+        self._edges_by_target[target].append(edge)
+        self._fed_inputs[(target, input_name)] = edge
+
+        return edge
+
+    @property
+    def nodes(self) -> Iterator[str]:
+        return iter(self._nodes.keys())
+
+    @property
+    def edges(self) -> Iterator[PipelineEdge]:
+        return iter(self._edges)
+
+    def check(self) -> Tuple[Dict[str, Optional[UFDLJobContract]], Dict[Union[str, PipelineEdge], Exception]]:
+        """
+        Type-checks every edge of the pipeline in one pass, inferring the type-arguments
+        of nodes given as contract classes from the outputs which feed them (in
+        topological order, so inferred types flow along chains of nodes).
+
+        :return:
+                    The contract of each node (None where it could not be determined), and
+                    a map from each failed node-name or edge to the error that occurred.
+        """
+        contracts: Dict[str, Optional[UFDLJobContract]] = {}
+        errors: Dict[Union[str, PipelineEdge], Exception] = {}
+        subtype_memo: Dict[Tuple[Hashable, Hashable], bool] = {}
+
+        order, cyclic = self._topological_order()
+        for node_name in cyclic:
+            contracts[node_name] = None
+            errors[node_name] = ValueError(f"Node '{node_name}' is part of a cycle")
+
+        for node_name in order:
+            node = self._nodes[node_name]
+
+            # Only check edges whose source is known
+            incoming: List[Tuple[PipelineEdge, UFDLType]] = [
+                (edge, contracts[edge.source].outputs[edge.output_name].type)
+                for edge in self._edges_by_target[node_name]
+                if contracts[edge.source] is not None
+            ]
+
+            if not isinstance(node, UFDLJobContract):
+                try:
+                    node = node.infer(inputs={
+                        edge.input_name: JobOutput((output_type,))
+                        for edge, output_type in incoming
+                    })
+                except Exception as e:
+                    contracts[node_name] = None
+                    errors[node_name] = e
+                    continue
+
+            contracts[node_name] = node
+
+            for edge, output_type in incoming:
+                if not self._accepts(node.inputs[edge.input_name].types, output_type, subtype_memo):
+                    errors[edge] = ValueError(
+                        f"Output of type {output_type} is not accepted by input of types "
+                        f"{', '.join(map(str, node.inputs[edge.input_name].types))}"
+                    )
+
+        return contracts, errors
+
+    def validate(self) -> Dict[str, UFDLJobContract]:
+        """
+        Type-checks the pipeline, raising all errors together.
+
+        :return:
+                    The contract of each node.
+        """
+        contracts, errors = self.check()
+
+        if len(errors) > 0:
+            raise PipelineTypeException(errors)
+
+        return contracts
+
+    def _contract_class(self, node_name: str) -> Type[UFDLJobContract]:
+        node = self._nodes[node_name]
+        return node if isinstance(node, type) else type(node)
+
+    def _topological_order(self) -> Tuple[List[str], List[str]]:
+        """
+        Orders the nodes so that every node comes after the nodes which feed it.
+
+        :return:
+                    The ordered nodes, and the nodes which are on (or downstream of) a cycle.
+        """
+        num_sources: Dict[str, int] = {
+            node_name: len({edge.source for edge in edges})
+            for node_name, edges in self._edges_by_target.items()
+        }
+        targets: Dict[str, set] = {node_name: set() for node_name in self._nodes}
+        for edge in self._edges:
+            targets[edge.source].add(edge.target)
+
+        order = [node_name for node_name, count in num_sources.items() if count == 0]
+        index = 0
+        while index < len(order):
+            for target in targets[order[index]]:
+                num_sources[target] -= 1
+                if num_sources[target] == 0:
+                    order.append(target)
+            index += 1
+
+        ordered = set(order)
+        return order, [node_name for node_name in self._nodes if node_name not in ordered]
+
+    @staticmethod
+    def _accepts(
+            input_types: Tuple[UFDLType, ...],
+            output_type: UFDLType,
+            subtype_memo: Dict[Tuple[Hashable, Hashable], bool]
+    ) -> bool:
+        """
+        Whether an input of the given types can be fed by an output of the given type,
+        memoising the sub-type tests across the whole check.
+        """
+        output_key = type_key(output_type)
+        for input_type in input_types:
+            if not isinstance(input_type, JobOutput):
+                continue
+            accepted_type = input_type.type_args[0]
+            memo_key = (output_key, type_key(accepted_type))
+            result = subtype_memo.get(memo_key, None)
+            if result is None:
+                result = subtype_memo[memo_key] = is_subtype(output_type, accepted_type)
+            if result:
+                return True
+        return False
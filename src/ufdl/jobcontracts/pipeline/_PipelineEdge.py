@@ -0,0 +1,14 @@
+from typing import NamedTuple
+
+
+class PipelineEdge(NamedTuple):
+    """
+    Connection of an output of one node of a pipeline to an input of another.
+    """
+    source: str
+    output_name: str
+    target: str
+    input_name: str
+
+    def __str__(self):
+        return f"{self.source}.{self.output_name} -> {self.target}.{self.input_name}"
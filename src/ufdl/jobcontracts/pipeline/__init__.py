@@ -0,0 +1,2 @@
+from ._ContractPipeline import ContractPipeline
+from ._PipelineEdge import PipelineEdge
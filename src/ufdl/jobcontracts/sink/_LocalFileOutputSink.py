@@ -0,0 +1,62 @@
+import os
+import tempfile
+from typing import IO, Optional, Union
+
+from ._OutputSink import OutputSink
+
+
+class LocalFileOutputSink(OutputSink):
+    """
+    Output sink which writes the value to a file on the local filesystem. The value
+    is written to a temporary file alongside the destination, which is only renamed
+    into place once complete, so the destination never holds a partial value. The
+    temporary file is only created when the sink is entered or first written to.
+    """
+    def __init__(self, path: Union[str, os.PathLike], *, algorithm: str = "sha256"):
+        super().__init__(algorithm=algorithm)
+
+        self._path: str = os.fspath(path)
+        self._temp_path: Optional[str] = None
+        self._file: Optional[IO[bytes]] = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def __enter__(self) -> 'LocalFileOutputSink':
+        self._open()
+        return self
+
+    def _open(self) -> IO[bytes]:
+        """
+        Creates the temporary file, if it hasn't been already.
+        """
+        if self._file is None:
+            directory, filename = os.path.split(os.path.abspath(self._path))
+            descriptor, self._temp_path = tempfile.mkstemp(prefix=f".{filename}.", suffix=".part", dir=directory)
+            self._file = os.fdopen(descriptor, "wb")
+        return self._file
+
+    def _write(self, chunk: Union[bytes, bytearray, memoryview]):
+        self._open().write(chunk)
+
+    def _commit(self):
+        # An empty value still creates the destination file
+        self._open()
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.replace(self._temp_path, self._path)
+        except BaseException:
+            self._abort()
+            raise
+
+    def _abort(self):
+        if self._file is None:
+            return
+        self._file.close()
+        try:
+            os.remove(self._temp_path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,126 @@
+import hashlib
+from abc import ABC, abstractmethod
+from typing import IO, Iterable, Union
+
+# The default size of the chunks read from file-like sources
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class OutputSink(ABC):
+    """
+    Destination for the value of a binary output, which accepts the value in chunks
+    so that it never needs to be held in memory in full. Counts the bytes written and
+    computes a checksum of them as they arrive.
+
+    Used as a context manager, the written value is committed on normal exit and
+    discarded if an exception is raised.
+    """
+    def __init__(self, *, algorithm: str = "sha256"):
+        self._hash = hashlib.new(algorithm)
+        self._bytes_written: int = 0
+        self._closed: bool = False
+        self._committed: bool = False
+
+    @property
+    def bytes_written(self) -> int:
+        return self._bytes_written
+
+    @property
+    def checksum(self) -> str:
+        """
+        The hex-digest of the bytes written so far.
+        """
+        return self._hash.hexdigest()
+
+    @property
+    def committed(self) -> bool:
+        return self._committed
+
+    def write(self, chunk: Union[bytes, bytearray, memoryview]):
+        """
+        Writes the next chunk of the value.
+
+        :param chunk:
+                    The chunk.
+        """
+        if self._closed:
+            raise ValueError("Can't write to a closed sink")
+
+        self._write(chunk)
+        self._hash.update(chunk)
+        self._bytes_written += len(chunk)
+
+    def consume(
+            self,
+            source: Union[bytes, IO[bytes], Iterable[bytes]],
+            chunk_size: int = DEFAULT_CHUNK_SIZE
+    ):
+        """
+        Writes all chunks from a source.
+
+        :param source:
+                    The value in full, a binary file-like object to read it from,
+                    or an iterable of its chunks.
+        :param chunk_size:
+                    The size of the chunks to read from a file-like object.
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self.write(source)
+        elif hasattr(source, "read"):
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                self.write(chunk)
+        else:
+            for chunk in source:
+                self.write(chunk)
+
+    def close(self):
+        """
+        Commits the written value to the destination.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._commit()
+        self._committed = True
+
+    def abort(self):
+        """
+        Discards the written value.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._abort()
+
+    def __enter__(self) -> 'OutputSink':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    @abstractmethod
+    def _write(self, chunk: Union[bytes, bytearray, memoryview]):
+        """
+        Writes a chunk to the destination.
+        """
+        raise NotImplementedError(self._write.__name__)
+
+    @abstractmethod
+    def _commit(self):
+        """
+        Makes the written value available at the destination.
+        """
+        raise NotImplementedError(self._commit.__name__)
+
+    @abstractmethod
+    def _abort(self):
+        """
+        Cleans up any partially-written value.
+        """
+        raise NotImplementedError(self._abort.__name__)
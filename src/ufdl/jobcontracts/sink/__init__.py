@@ -0,0 +1,2 @@
+from ._LocalFileOutputSink import LocalFileOutputSink
+from ._OutputSink import DEFAULT_CHUNK_SIZE, OutputSink
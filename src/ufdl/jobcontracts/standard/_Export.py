@@ -14,4 +14,4 @@ class Export(
     """
     A placeholder for the Export contract.
     """
-    pass
+    __slots__ = tuple()
@@ -48,6 +48,8 @@ class Predict(
         )
     }
 ):
+    __slots__ = tuple()
+
     @property
     def domain_type(self) -> Domain:
         return self.types[DomainType]
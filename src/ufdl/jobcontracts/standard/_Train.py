@@ -44,6 +44,8 @@ class Train(
     """
     Job contract for jobs which train a model from a dataset.
     """
+    __slots__ = tuple()
+
     @property
     def domain_type(self) -> Domain:
         return self.types[DomainType]
@@ -1,3 +1,29 @@
-from ._Export import Export
-from ._Predict import Predict
-from ._Train import Train
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ._Export import Export
+    from ._Predict import Predict
+    from ._Train import Train
+
+# The standard contracts are only imported when first accessed
+LAZY_IMPORTS = {
+    "Export": "._Export",
+    "Predict": "._Predict",
+    "Train": "._Train"
+}
+
+__all__ = list(LAZY_IMPORTS)
+
+
+def __getattr__(name: str):
+    module = LAZY_IMPORTS.get(name, None)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(LAZY_IMPORTS))
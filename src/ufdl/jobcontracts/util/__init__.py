@@ -1,2 +1,3 @@
 from ._format import format_contract_type, format_contract
-from ._parse import parse_contract
+from ._parse import normalise_contract_string, parse_contract, parse_contracts
+from ._serialise import decode_contract, decode_contract_to_dict, encode_contract
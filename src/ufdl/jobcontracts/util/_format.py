@@ -1,7 +1,6 @@
 from typing import Type
 
 from ..base import UFDLJobContract
-from ..initialise import name_type_translate
 
 
 def format_contract_type(
@@ -12,13 +11,7 @@ def format_contract_type(
     if contract_type is UFDLJobContract:
         raise Exception(f"Can't format base contract class {UFDLJobContract.__qualname__}")
 
-    contract_name = name_type_translate(contract_type)
-    contract_params = contract_type.params()
-
-    if not include_io:
-        return f"{contract_name}{contract_params}"
-
-    raise NotImplementedError()
+    return contract_type.format(include_io=include_io)
 
 
 def format_contract(
@@ -26,17 +19,4 @@ def format_contract(
         *,
         include_io: bool = False
 ) -> str:
-    if not include_io:
-        return str(contract)
-
-    inputs = ",\n".join(
-        f"\t{input_name}: " + " | ".join(map(str, input.types))
-        for input_name, input in contract.inputs.items()
-    )
-
-    outputs = ",\n".join(
-        f"\t{output_name}: {output.type}"
-        for output_name, output in contract.outputs.items()
-    )
-
-    return f"{contract}(\n{inputs}\n) -> {{\n{outputs}\n}}"
+    return contract.formatted(include_io=include_io)
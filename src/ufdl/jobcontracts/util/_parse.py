@@ -1,46 +1,258 @@
-from typing import Type
+import re
+from typing import Dict, Iterable, List, Optional, Tuple, Type, Union
 
-from ufdl.jobtypes.util import parse_args
+from ufdl.jobtypes.base import UFDLType
+from ufdl.jobtypes.util import parse_type
 
 from ..base import UFDLJobContract
+from ..cache import CONTRACT_STRING_CACHE
 from ..error import ContractParsingException
 from ..initialise import name_type_translate
+from ..instrumentation import instrumented
+from ..params import JobContractParam
 
 
+# String literals (which are left untouched), or whitespace surrounding
+# the structural characters of a contract-string
+NORMALISATION_PATTERN = re.compile(r"""("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')|\s*([<>,])\s*""")
+
+
+def normalise_contract_string(contract_string: str) -> str:
+    """
+    Normalises a contract-string so that strings differing only in
+    insignificant whitespace are equal.
+
+    :param contract_string:
+                The contract-string to normalise.
+    :return:
+                The normalised contract-string.
+    """
+    return NORMALISATION_PATTERN.sub(
+        lambda match: match.group(1) or match.group(2),
+        contract_string.strip()
+    )
+
+
+@instrumented("parse_contract")
 def parse_contract(contract_string: str) -> UFDLJobContract:
     if not isinstance(contract_string, str):
         raise ContractParsingException(str(contract_string), "Not a string")
 
-    args_start = contract_string.find("<")
-    if args_start == -1:
-        name = contract_string.strip()
-        args = ""
-    else:
-        name = contract_string[:args_start].strip()
-        args = contract_string[args_start:].strip()
+    normalised = normalise_contract_string(contract_string)
 
-    contract_cls: Type[UFDLJobContract] = name_type_translate(name)
+    contract = CONTRACT_STRING_CACHE.get(normalised)
+    if contract is None:
+        contract = _parse_contract(contract_string)
+        CONTRACT_STRING_CACHE.put(normalised, contract)
 
-    if contract_cls is None:
-        raise ContractParsingException(contract_string, f"Unknown contract-name \"{name}\"")
+    return contract
+
+
+def parse_contracts(
+        contract_strings: Iterable[str]
+) -> Tuple[List[Optional[UFDLJobContract]], Dict[int, Exception]]:
+    """
+    Parses a number of contract-strings at once. Each distinct contract-string
+    is only parsed once, and contracts of the same class are instantiated together
+    via UFDLJobContract.instantiate_many.
+
+    :param contract_strings:
+                The contract-strings to parse.
+    :return:
+                The parsed contracts, in order, with None in place of any contract-string
+                which failed to parse, and a map from the index of each failed
+                contract-string to the error that occurred.
+    """
+    results: List[Optional[UFDLJobContract]] = []
+    errors: Dict[int, Exception] = {}
+
+    # Parse each distinct contract-string into its class and type-arguments
+    parsed: Dict[str, Union[UFDLJobContract, Tuple[Type[UFDLJobContract], Dict[str, UFDLType]], Exception]] = {}
+    normalised_strings: List[Union[str, ContractParsingException]] = []
+    for contract_string in contract_strings:
+        if not isinstance(contract_string, str):
+            normalised_strings.append(ContractParsingException(str(contract_string), "Not a string"))
+            continue
+
+        normalised = normalise_contract_string(contract_string)
+        normalised_strings.append(normalised)
+        if normalised in parsed:
+            continue
+
+        contract = CONTRACT_STRING_CACHE.get(normalised)
+        if contract is not None:
+            parsed[normalised] = contract
+            continue
+
+        try:
+            parsed[normalised] = _parse_contract_parts(contract_string)
+        except ContractParsingException as e:
+            parsed[normalised] = e
+
+    # Instantiate the contracts, grouped by class
+    to_instantiate: Dict[Type[UFDLJobContract], List[str]] = {}
+    for normalised, parts in parsed.items():
+        if isinstance(parts, tuple):
+            to_instantiate.setdefault(parts[0], []).append(normalised)
+    for contract_cls, normalised_group in to_instantiate.items():
+        contracts, instantiation_errors = contract_cls.instantiate_many(
+            parsed[normalised][1]
+            for normalised in normalised_group
+        )
+        for index, (normalised, contract) in enumerate(zip(normalised_group, contracts)):
+            if contract is None:
+                cause = instantiation_errors[index]
+                parsed[normalised] = ContractParsingException(normalised, cause)
+                parsed[normalised].__cause__ = cause
+            else:
+                parsed[normalised] = contract
+                CONTRACT_STRING_CACHE.put(normalised, contract)
+
+    for index, normalised in enumerate(normalised_strings):
+        result = normalised if isinstance(normalised, Exception) else parsed[normalised]
+        if isinstance(result, Exception):
+            results.append(None)
+            errors[index] = result
+        else:
+            results.append(result)
+
+    return results, errors
+
+
+def _parse_contract(contract_string: str) -> UFDLJobContract:
+    contract_cls, types = _parse_contract_parts(contract_string)
 
     try:
-        type_args = parse_args(args)
-        params = contract_cls.params()
+        return contract_cls(types)
     except Exception as e:
         raise ContractParsingException(contract_string, e) from e
 
+
+def _parse_contract_parts(contract_string: str) -> Tuple[Type[UFDLJobContract], Dict[str, UFDLType]]:
+    """
+    Parses a contract-string into its contract class and type-arguments,
+    without instantiating the contract. The string is scanned once: the
+    contract class is resolved as soon as its name has been read, and each
+    type-argument is parsed (and the arity checked) as soon as its end is found.
+    """
+    length = len(contract_string)
+
+    # Read the contract name
+    position = _skip_whitespace(contract_string, 0)
+    name_start = position
+    while position < length and (contract_string[position].isalnum() or contract_string[position] == "_"):
+        position += 1
+    name = contract_string[name_start:position]
+
+    if name == "":
+        raise ContractParsingException(contract_string, "Expected a contract-name", position=position)
+
+    contract_cls: Type[UFDLJobContract] = name_type_translate(name)
+
+    if contract_cls is None:
+        raise ContractParsingException(contract_string, f"Unknown contract-name \"{name}\"", position=name_start)
+
+    params = tuple(contract_cls.params())
     num_params = len(params)
-    num_args = len(type_args)
-    if num_args != num_params:
-        raise ContractParsingException(contract_string, f"Expected {num_params} type-arguments but got {num_args}")
+    types: Dict[str, UFDLType] = {}
 
-    try:
-        return contract_cls(
-            {
-                param.name: type_arg
-                for type_arg, param in zip(type_args, params)
-            }
+    position = _skip_whitespace(contract_string, position)
+    if position < length:
+        if contract_string[position] != "<":
+            raise ContractParsingException(
+                contract_string,
+                f"Expected '<' but found '{contract_string[position]}'",
+                position=position
+            )
+        position = _parse_type_args(contract_string, position + 1, params, types)
+        position = _skip_whitespace(contract_string, position)
+        if position < length:
+            raise ContractParsingException(contract_string, "Unexpected characters after type-arguments", position=position)
+
+    num_args = len(types)
+    if num_args != num_params:
+        raise ContractParsingException(
+            contract_string,
+            f"Expected {num_params} type-arguments but got {num_args}",
+            position=position
         )
-    except Exception as e:
-        raise ContractParsingException(contract_string, e) from e
+
+    return contract_cls, types
+
+
+def _parse_type_args(
+        contract_string: str,
+        position: int,
+        params: Tuple[JobContractParam, ...],
+        types: Dict[str, UFDLType]
+) -> int:
+    """
+    Parses the type-arguments of a contract-string into the given dictionary.
+
+    :param contract_string:
+                The contract-string being parsed.
+    :param position:
+                The position just after the opening '<' of the type-arguments.
+    :param params:
+                The parameters of the contract.
+    :param types:
+                The dictionary to add the parsed type-arguments to.
+    :return:
+                The position just after the closing '>' of the type-arguments.
+    """
+    length = len(contract_string)
+    num_params = len(params)
+    arg_start = position
+    depth = 0
+    while position < length:
+        char = contract_string[position]
+
+        if char == '"' or char == "'":
+            # Skip over string literals, respecting escapes
+            quote_start = position
+            position += 1
+            while position < length and contract_string[position] != char:
+                position += 2 if contract_string[position] == "\\" else 1
+            if position >= length:
+                raise ContractParsingException(contract_string, "Unterminated string literal", position=quote_start)
+        elif char == "<":
+            depth += 1
+        elif char == ">" and depth > 0:
+            depth -= 1
+        elif depth == 0 and (char == "," or char == ">"):
+            arg = contract_string[arg_start:position].strip()
+
+            # An empty argument-list is allowed, but not empty arguments
+            if arg == "":
+                if char == ">" and len(types) == 0:
+                    return position + 1
+                raise ContractParsingException(contract_string, "Empty type-argument", position=position)
+
+            num_args = len(types)
+            if num_args == num_params:
+                raise ContractParsingException(
+                    contract_string,
+                    f"Expected {num_params} type-arguments but got more",
+                    position=arg_start
+                )
+
+            try:
+                types[params[num_args].name] = parse_type(arg)
+            except Exception as e:
+                raise ContractParsingException(contract_string, e, position=arg_start) from e
+
+            if char == ">":
+                return position + 1
+
+            arg_start = position + 1
+
+        position += 1
+
+    raise ContractParsingException(contract_string, "Unterminated type-arguments", position=length)
+
+
+def _skip_whitespace(contract_string: str, position: int) -> int:
+    length = len(contract_string)
+    while position < length and contract_string[position].isspace():
+        position += 1
+    return position
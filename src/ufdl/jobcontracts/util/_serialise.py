@@ -0,0 +1,172 @@
+from typing import Any, Dict, List, Tuple
+
+from ..base import UFDLJobContract
+
+# Marks the start of a binary-encoded contract
+MAGIC = b"UFDLJC"
+
+# The version of the binary encoding
+ENCODING_VERSION = 1
+
+
+def encode_contract(contract: UFDLJobContract) -> bytes:
+    """
+    Encodes a contract in a compact binary form, which includes its inputs,
+    outputs and help text.
+
+    :param contract:
+                The contract to encode.
+    :return:
+                The binary encoding.
+    """
+    data = contract.to_dict()
+
+    buffer = bytearray(MAGIC)
+    buffer.append(ENCODING_VERSION)
+    _write_string(buffer, data["contract"])
+    _write_bytes(buffer, bytes.fromhex(data["signature"]))
+
+    _write_uint(buffer, len(data["types"]))
+    for param_name, type_string in data["types"].items():
+        _write_string(buffer, param_name)
+        _write_string(buffer, type_string)
+
+    _write_uint(buffer, len(data["inputs"]))
+    for input_name, input in data["inputs"].items():
+        _write_string(buffer, input_name)
+        _write_string(buffer, input["help"])
+        _write_uint(buffer, len(input["types"]))
+        for type_string in input["types"]:
+            _write_string(buffer, type_string)
+
+    _write_uint(buffer, len(data["outputs"]))
+    for output_name, output in data["outputs"].items():
+        _write_string(buffer, output_name)
+        _write_string(buffer, output["help"])
+        _write_string(buffer, output["type"])
+
+    return bytes(buffer)
+
+
+def decode_contract_to_dict(encoded: bytes) -> Dict[str, Any]:
+    """
+    Decodes a binary-encoded contract into the dictionary form
+    produced by UFDLJobContract.to_dict.
+
+    :param encoded:
+                The binary encoding.
+    :return:
+                The dictionary form of the contract.
+    """
+    encoded = memoryview(encoded)
+
+    if bytes(encoded[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Not a binary-encoded contract")
+    position = len(MAGIC)
+
+    if len(encoded) <= position or encoded[position] != ENCODING_VERSION:
+        raise ValueError("Unsupported contract encoding version")
+    position += 1
+
+    try:
+        contract_name, position = _read_string(encoded, position)
+        signature, position = _read_bytes(encoded, position)
+
+        types = {}
+        num_types, position = _read_uint(encoded, position)
+        for _ in range(num_types):
+            param_name, position = _read_string(encoded, position)
+            types[param_name], position = _read_string(encoded, position)
+
+        inputs = {}
+        num_inputs, position = _read_uint(encoded, position)
+        for _ in range(num_inputs):
+            input_name, position = _read_string(encoded, position)
+            help, position = _read_string(encoded, position)
+            input_types: List[str] = []
+            num_input_types, position = _read_uint(encoded, position)
+            for _ in range(num_input_types):
+                input_type, position = _read_string(encoded, position)
+                input_types.append(input_type)
+            inputs[input_name] = {"types": input_types, "help": help}
+
+        outputs = {}
+        num_outputs, position = _read_uint(encoded, position)
+        for _ in range(num_outputs):
+            output_name, position = _read_string(encoded, position)
+            help, position = _read_string(encoded, position)
+            output_type, position = _read_string(encoded, position)
+            outputs[output_name] = {"type": output_type, "help": help}
+    except IndexError as e:
+        raise ValueError("Truncated contract encoding") from e
+
+    if position != len(encoded):
+        raise ValueError("Trailing data after contract encoding")
+
+    return {
+        "contract": contract_name,
+        "types": types,
+        "inputs": inputs,
+        "outputs": outputs,
+        "signature": signature.hex()
+    }
+
+
+def decode_contract(encoded: bytes, *, trusted: bool = False) -> UFDLJobContract:
+    """
+    Decodes a binary-encoded contract.
+
+    :param encoded:
+                The binary encoding.
+    :param trusted:
+                Whether the encoding comes from a trusted source, in which case
+                the type-arguments are not re-validated if the signature matches.
+    :return:
+                The contract.
+    """
+    return UFDLJobContract.from_dict(decode_contract_to_dict(encoded), trusted=trusted)
+
+
+def _write_uint(buffer: bytearray, value: int):
+    # Unsigned LEB128
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value == 0:
+            buffer.append(byte)
+            return
+        buffer.append(byte | 0x80)
+
+
+def _write_bytes(buffer: bytearray, value: bytes):
+    _write_uint(buffer, len(value))
+    buffer += value
+
+
+def _write_string(buffer: bytearray, value: str):
+    _write_bytes(buffer, value.encode("utf-8"))
+
+
+def _read_uint(encoded: memoryview, position: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = encoded[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80 == 0:
+            return value, position
+        shift += 7
+
+
+def _read_bytes(encoded: memoryview, position: int) -> Tuple[bytes, int]:
+    length, position = _read_uint(encoded, position)
+    end = position + length
+    if end > len(encoded):
+        raise IndexError("Read past end of encoding")
+    return bytes(encoded[position:end]), end
+
+
+def _read_string(encoded: memoryview, position: int) -> Tuple[str, int]:
+    value, position = _read_bytes(encoded, position)
+    return value.decode("utf-8"), position